@@ -0,0 +1,189 @@
+from machine import Pin
+import array
+import rp2
+import time
+import uctypes
+
+#   Multiplexed 7 segment display behind a 74HC595, refreshed by PIO and DMA
+#
+#       digit 1        digit 2        digit 3        digit 4
+#        _a_            _a_            _a_            _a_
+#     f |_g_| b      f |_g_| b      f |_g_| b      f |_g_| b
+#     e |___| c _h   e |___| c _h   e |___| c _h   e |___| c _h
+#         d              d              d              d
+#
+# The PIO program pulls one 32 bit word per digit from the TX FIFO:
+#   bits 31-24  segment byte (hgfedcba), shifted into the 74HC595 with bit 7 first
+#   bits 23-16  digit select lines, written to the digit pins after the latch (0 turns a digit on)
+#   bits 15-0   on-time in microseconds before every digit is switched off again
+# One DMA channel streams the frame array into the FIFO, a second DMA channel
+# rewrites the read address of the first so the frame repeats forever without the CPU.
+#
+# Wiring limits
+#   latch, clock and data must be three consecutive GPIOs (in any order), for example 6,7,8
+#   the digit pins must be consecutive GPIOs, for example [3,2,1,0]
+
+segnum = [0x3F,0x06,0x5B,0x4F,0x66,0x6D,0x7D,0x07,0x7F,0x67]
+fourdigitpins = [3,2,1,0]
+fourlatchpin = const(7) #RCLK
+fourclockpin = const(6) #SRCLK
+fourdatapin = const(8) #SER
+waitonpaint_us = 1000
+
+PIO_FREQ = 1_000_000 # one PIO cycle per microsecond
+DMA_BASE = const(0x50000000)
+DMA_CH_SIZE = const(0x40)
+DMA_AL3_READ_ADDR_TRIG = const(0x3C)
+PIO_BASE = (0x50200000, 0x50300000)
+PIO_TXF0 = const(0x10)
+DREQ_PIO_TX = (0, 8)
+
+def _make_program(clock_bit, latch_bit, data_bit, ndigits):
+    CLK = 1 << clock_bit
+    LAT = 1 << latch_bit
+    DAT = 1 << data_bit
+
+    @rp2.asm_pio(set_init=(rp2.PIO.OUT_LOW,) * 3, out_init=(rp2.PIO.OUT_HIGH,) * ndigits,
+                 out_shiftdir=rp2.PIO.SHIFT_LEFT, autopull=True, pull_thresh=32)
+    def shift595():
+        wrap_target()
+        set(pins, 0)
+        set(x, 7)
+        label("bitloop")
+        out(y, 1)
+        jmp(not_y, "zero")
+        set(pins, DAT)
+        set(pins, DAT | CLK)
+        jmp(x_dec, "bitloop")
+        jmp("latch")
+        label("zero")
+        set(pins, 0)
+        set(pins, CLK)
+        jmp(x_dec, "bitloop")
+        label("latch")
+        set(pins, LAT)
+        out(pins, 8)
+        out(y, 16)
+        label("hold")
+        jmp(y_dec, "hold")
+        mov(pins, invert(null))
+        wrap()
+
+    return shift595
+
+class pio595display:
+    def __init__(self, latch_pin=fourlatchpin, clock_pin=fourclockpin, data_pin=fourdatapin,
+                 digit_pins=fourdigitpins, sm_id=0, on_us=waitonpaint_us):
+        self.shiftbase = min(latch_pin, clock_pin, data_pin)
+        if max(latch_pin, clock_pin, data_pin) - self.shiftbase != 2:
+            raise ValueError("latch, clock and data pins must be consecutive")
+        self.digitbase = min(digit_pins)
+        if max(digit_pins) - self.digitbase != len(digit_pins) - 1 or len(digit_pins) > 8:
+            raise ValueError("digit pins must be consecutive")
+
+        self.digit_pins = digit_pins
+        self.on_us = on_us
+        self.sm_id = sm_id
+        # one word per digit, written in place so the DMA picks up changes on the next refresh
+        self.frame = array.array("I", [0 for _ in digit_pins])
+        self._frameaddr = array.array("I", [uctypes.addressof(self.frame)])
+        for d in range(len(digit_pins)):
+            self.set_digit(d, 0)
+
+        program = _make_program(clock_pin - self.shiftbase, latch_pin - self.shiftbase, data_pin - self.shiftbase,
+                                len(digit_pins))
+        self.sm = rp2.StateMachine(sm_id, program, freq=PIO_FREQ,
+                                   set_base=Pin(self.shiftbase), out_base=Pin(self.digitbase))
+        self._data = None
+        self._control = None
+
+    def _digitmask(self, d):
+        return 0xFF & ~(1 << (self.digit_pins[d] - self.digitbase))
+
+    def set_digit(self, d, val):
+        self.frame[d] = ((val & 0xFF) << 24) | (self._digitmask(d) << 16) | (self.on_us & 0xFFFF)
+
+    def clear(self):
+        for d in range(len(self.frame)):
+            self.set_digit(d, 0)
+
+    def printnum(self, n):
+        self.clear()
+        num = "{0}".format(n)
+        d = len(self.frame)-1
+        i = len(num)-1
+        while i >= 0 and d >= 0:
+            if(num[i].isdigit()):
+                self.set_digit(d, segnum[int(num[i])])
+                d -= 1
+            i -= 1
+
+    def printfloat(self, f):
+        self.clear()
+        num = "{:.2f}".format(f)
+        i = len(num)-1
+        decimal = False
+        d = len(self.frame)-1
+        while i >= 0 and d >= 0:
+            if(num[i].isdigit()):
+                val = segnum[int(num[i])]
+                if decimal:
+                    val |= 0x01 << 7
+                    decimal = False
+                self.set_digit(d, val)
+                d -= 1
+            else:
+                decimal = True
+            i -= 1
+
+    def start(self):
+        if self._data is not None:
+            return
+        pio = self.sm_id // 4
+        sm = self.sm_id % 4
+        self._data = rp2.DMA()
+        self._control = rp2.DMA()
+
+        # data channel: frame -> PIO TX FIFO, paced by the FIFO, then hands over to the control channel
+        data_ctrl = self._data.pack_ctrl(size=2, inc_read=True, inc_write=False,
+                                         treq_sel=DREQ_PIO_TX[pio] + sm, chain_to=self._control.channel)
+        self._data.config(read=self.frame, write=PIO_BASE[pio] + PIO_TXF0 + 4 * sm,
+                          count=len(self.frame), ctrl=data_ctrl)
+
+        # control channel: rewind the data channel to the start of the frame and retrigger it
+        control_ctrl = self._control.pack_ctrl(size=2, inc_read=False, inc_write=False)
+        self.sm.active(1)
+        self._control.config(read=self._frameaddr,
+                             write=DMA_BASE + DMA_CH_SIZE * self._data.channel + DMA_AL3_READ_ADDR_TRIG,
+                             count=1, ctrl=control_ctrl, trigger=True)
+
+    def stop(self):
+        if self._data is None:
+            return
+        self._control.active(0)
+        self._data.active(0)
+        self.sm.active(0)
+        self._control.close()
+        self._data.close()
+        self._control = None
+        self._data = None
+        # switch every digit off
+        for p in self.digit_pins:
+            Pin(p, Pin.OUT).high()
+
+def main():
+    display = pio595display()
+    display.start()
+    try:
+        print("display test...")
+        i = 1
+        while i <= 20:
+            display.printfloat(i)
+            time.sleep(0.5)
+            i += 1.125
+    finally:
+        display.stop()
+        print("test finished")
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,56 @@
+import time
+import matrix_bcm
+
+# Measures the refresh rate the BCM scanner can sustain on this board
+# For each bit depth the tick period is lowered until the timer callback no longer keeps up
+# (fewer than 98% of the expected ticks are serviced), the fastest passing period sets the
+# achievable frame rate for that depth
+# The cost of one callback is also timed directly, without the timer
+
+BASE_US = [400, 200, 100, 50, 25, 10]
+RUN_MS = 1000
+CALLS = 2000
+
+def callback_cost_us(display):
+    start = time.ticks_us()
+    for _ in range(CALLS):
+        display._tick(None)
+    return time.ticks_diff(time.ticks_us(), start) / CALLS
+
+def tick_ratio(display):
+    display.start()
+    start = time.ticks_us()
+    time.sleep_ms(RUN_MS)
+    ticks = display.ticks
+    elapsed = time.ticks_diff(time.ticks_us(), start)
+    display.stop()
+    expected = elapsed / display.base_us
+    return ticks / expected
+
+def main():
+    print("depth  base_us  ticks_ok%  frame_hz  callback_us")
+    try:
+        for depth in range(1, 5):
+            best = None
+            for base_us in BASE_US:
+                display = matrix_bcm.BCMMatrix8x8(depth=depth, base_us=base_us)
+                for col in range(display.ncols):
+                    display.set_pixel(col, col, display.maxlevel)
+                display.show()
+                cost = callback_cost_us(display)
+                ratio = tick_ratio(display)
+                ok = ratio >= 0.98
+                print("{0:5d}  {1:7d}  {2:9.1f}  {3:8.1f}  {4:11.1f}".format(
+                    depth, base_us, ratio * 100, display.frame_hz(), cost))
+                if not ok:
+                    break
+                best = display.frame_hz()
+            if best is None:
+                print("depth {0}: no tick period kept up".format(depth))
+            else:
+                print("depth {0}: {1:.1f} Hz achievable".format(depth, best))
+    except KeyboardInterrupt:
+        print("Program shut down by user")
+
+if __name__ == "__main__":
+    main()
@@ -1,153 +1,166 @@
-font8x8_basic = [
-    [ 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00],   # U+0000 (nul)
-    [ 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00],   # U+0001
-    [ 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00],   # U+0002
-    [ 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00],   # U+0003
-    [ 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00],   # U+0004
-    [ 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00],   # U+0005
-    [ 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00],   # U+0006
-    [ 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00],   # U+0007
-    [ 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00],   # U+0008
-    [ 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00],   # U+0009
-    [ 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00],   # U+000A
-    [ 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00],   # U+000B
-    [ 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00],   # U+000C
-    [ 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00],   # U+000D
-    [ 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00],   # U+000E
-    [ 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00],   # U+000F
-    [ 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00],   # U+0010
-    [ 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00],   # U+0011
-    [ 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00],   # U+0012
-    [ 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00],   # U+0013
-    [ 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00],   # U+0014
-    [ 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00],   # U+0015
-    [ 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00],   # U+0016
-    [ 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00],   # U+0017
-    [ 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00],   # U+0018
-    [ 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00],   # U+0019
-    [ 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00],   # U+001A
-    [ 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00],   # U+001B
-    [ 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00],   # U+001C
-    [ 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00],   # U+001D
-    [ 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00],   # U+001E
-    [ 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00],   # U+001F
-    [ 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00],   # U+0020 (space)
-    [ 0x18, 0x3C, 0x3C, 0x18, 0x18, 0x00, 0x18, 0x00],   # U+0021 (!)
-    [ 0x36, 0x36, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00],   # U+0022 (")
-    [ 0x36, 0x36, 0x7F, 0x36, 0x7F, 0x36, 0x36, 0x00],   # U+0023 (#)
-    [ 0x0C, 0x3E, 0x03, 0x1E, 0x30, 0x1F, 0x0C, 0x00],   # U+0024 ($)
-    [ 0x00, 0x63, 0x33, 0x18, 0x0C, 0x66, 0x63, 0x00],   # U+0025 (%)
-    [ 0x1C, 0x36, 0x1C, 0x6E, 0x3B, 0x33, 0x6E, 0x00],   # U+0026 (&)
-    [ 0x06, 0x06, 0x03, 0x00, 0x00, 0x00, 0x00, 0x00],   # U+0027 (')
-    [ 0x18, 0x0C, 0x06, 0x06, 0x06, 0x0C, 0x18, 0x00],   # U+0028 (()
-    [ 0x06, 0x0C, 0x18, 0x18, 0x18, 0x0C, 0x06, 0x00],   # U+0029 ())
-    [ 0x00, 0x66, 0x3C, 0xFF, 0x3C, 0x66, 0x00, 0x00],   # U+002A (*)
-    [ 0x00, 0x0C, 0x0C, 0x3F, 0x0C, 0x0C, 0x00, 0x00],   # U+002B (+)
-    [ 0x00, 0x00, 0x00, 0x00, 0x00, 0x0C, 0x0C, 0x06],   # U+002C (,)
-    [ 0x00, 0x00, 0x00, 0x3F, 0x00, 0x00, 0x00, 0x00],   # U+002D (-)
-    [ 0x00, 0x00, 0x00, 0x00, 0x00, 0x0C, 0x0C, 0x00],   # U+002E (.)
-    [ 0x60, 0x30, 0x18, 0x0C, 0x06, 0x03, 0x01, 0x00],   # U+002F (/)
-    [ 0x3E, 0x63, 0x73, 0x7B, 0x6F, 0x67, 0x3E, 0x00],   # U+0030 (0)
-    [ 0x0C, 0x0E, 0x0C, 0x0C, 0x0C, 0x0C, 0x3F, 0x00],   # U+0031 (1)
-    [ 0x1E, 0x33, 0x30, 0x1C, 0x06, 0x33, 0x3F, 0x00],   # U+0032 (2)
-    [ 0x1E, 0x33, 0x30, 0x1C, 0x30, 0x33, 0x1E, 0x00],   # U+0033 (3)
-    [ 0x38, 0x3C, 0x36, 0x33, 0x7F, 0x30, 0x78, 0x00],   # U+0034 (4)
-    [ 0x3F, 0x03, 0x1F, 0x30, 0x30, 0x33, 0x1E, 0x00],   # U+0035 (5)
-    [ 0x1C, 0x06, 0x03, 0x1F, 0x33, 0x33, 0x1E, 0x00],   # U+0036 (6)
-    [ 0x3F, 0x33, 0x30, 0x18, 0x0C, 0x0C, 0x0C, 0x00],   # U+0037 (7)
-    [ 0x1E, 0x33, 0x33, 0x1E, 0x33, 0x33, 0x1E, 0x00],   # U+0038 (8)
-    [ 0x1E, 0x33, 0x33, 0x3E, 0x30, 0x18, 0x0E, 0x00],   # U+0039 (9)
-    [ 0x00, 0x0C, 0x0C, 0x00, 0x00, 0x0C, 0x0C, 0x00],   # U+003A (:)
-    [ 0x00, 0x0C, 0x0C, 0x00, 0x00, 0x0C, 0x0C, 0x06],   # U+003B (;)
-    [ 0x18, 0x0C, 0x06, 0x03, 0x06, 0x0C, 0x18, 0x00],   # U+003C (<)
-    [ 0x00, 0x00, 0x3F, 0x00, 0x00, 0x3F, 0x00, 0x00],   # U+003D (=)
-    [ 0x06, 0x0C, 0x18, 0x30, 0x18, 0x0C, 0x06, 0x00],   # U+003E (>)
-    [ 0x1E, 0x33, 0x30, 0x18, 0x0C, 0x00, 0x0C, 0x00],   # U+003F (?)
-    [ 0x3E, 0x63, 0x7B, 0x7B, 0x7B, 0x03, 0x1E, 0x00],   # U+0040 (@)
-    [ 0x0C, 0x1E, 0x33, 0x33, 0x3F, 0x33, 0x33, 0x00],   # U+0041 (A)
-    [ 0x3F, 0x66, 0x66, 0x3E, 0x66, 0x66, 0x3F, 0x00],   # U+0042 (B)
-    [ 0x3C, 0x66, 0x03, 0x03, 0x03, 0x66, 0x3C, 0x00],   # U+0043 (C)
-    [ 0x1F, 0x36, 0x66, 0x66, 0x66, 0x36, 0x1F, 0x00],   # U+0044 (D)
-    [ 0x7F, 0x46, 0x16, 0x1E, 0x16, 0x46, 0x7F, 0x00],   # U+0045 (E)
-    [ 0x7F, 0x46, 0x16, 0x1E, 0x16, 0x06, 0x0F, 0x00],   # U+0046 (F)
-    [ 0x3C, 0x66, 0x03, 0x03, 0x73, 0x66, 0x7C, 0x00],   # U+0047 (G)
-    [ 0x33, 0x33, 0x33, 0x3F, 0x33, 0x33, 0x33, 0x00],   # U+0048 (H)
-    [ 0x1E, 0x0C, 0x0C, 0x0C, 0x0C, 0x0C, 0x1E, 0x00],   # U+0049 (I)
-    [ 0x78, 0x30, 0x30, 0x30, 0x33, 0x33, 0x1E, 0x00],   # U+004A (J)
-    [ 0x67, 0x66, 0x36, 0x1E, 0x36, 0x66, 0x67, 0x00],   # U+004B (K)
-    [ 0x0F, 0x06, 0x06, 0x06, 0x46, 0x66, 0x7F, 0x00],   # U+004C (L)
-    [ 0x63, 0x77, 0x7F, 0x7F, 0x6B, 0x63, 0x63, 0x00],   # U+004D (M)
-    [ 0x63, 0x67, 0x6F, 0x7B, 0x73, 0x63, 0x63, 0x00],   # U+004E (N)
-    [ 0x1C, 0x36, 0x63, 0x63, 0x63, 0x36, 0x1C, 0x00],   # U+004F (O)
-    [ 0x3F, 0x66, 0x66, 0x3E, 0x06, 0x06, 0x0F, 0x00],   # U+0050 (P)
-    [ 0x1E, 0x33, 0x33, 0x33, 0x3B, 0x1E, 0x38, 0x00],   # U+0051 (Q)
-    [ 0x3F, 0x66, 0x66, 0x3E, 0x36, 0x66, 0x67, 0x00],   # U+0052 (R)
-    [ 0x1E, 0x33, 0x07, 0x0E, 0x38, 0x33, 0x1E, 0x00],   # U+0053 (S)
-    [ 0x3F, 0x2D, 0x0C, 0x0C, 0x0C, 0x0C, 0x1E, 0x00],   # U+0054 (T)
-    [ 0x33, 0x33, 0x33, 0x33, 0x33, 0x33, 0x3F, 0x00],   # U+0055 (U)
-    [ 0x33, 0x33, 0x33, 0x33, 0x33, 0x1E, 0x0C, 0x00],   # U+0056 (V)
-    [ 0x63, 0x63, 0x63, 0x6B, 0x7F, 0x77, 0x63, 0x00],   # U+0057 (W)
-    [ 0x63, 0x63, 0x36, 0x1C, 0x1C, 0x36, 0x63, 0x00],   # U+0058 (X)
-    [ 0x33, 0x33, 0x33, 0x1E, 0x0C, 0x0C, 0x1E, 0x00],   # U+0059 (Y)
-    [ 0x7F, 0x63, 0x31, 0x18, 0x4C, 0x66, 0x7F, 0x00],   # U+005A (Z)
-    [ 0x1E, 0x06, 0x06, 0x06, 0x06, 0x06, 0x1E, 0x00],   # U+005B ([)
-    [ 0x03, 0x06, 0x0C, 0x18, 0x30, 0x60, 0x40, 0x00],   # U+005C (\)
-    [ 0x1E, 0x18, 0x18, 0x18, 0x18, 0x18, 0x1E, 0x00],   # U+005D (])
-    [ 0x08, 0x1C, 0x36, 0x63, 0x00, 0x00, 0x00, 0x00],   # U+005E (^)
-    [ 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0xFF],   # U+005F (_)
-    [ 0x0C, 0x0C, 0x18, 0x00, 0x00, 0x00, 0x00, 0x00],   # U+0060 (`)
-    [ 0x00, 0x00, 0x1E, 0x30, 0x3E, 0x33, 0x6E, 0x00],   # U+0061 (a)
-    [ 0x07, 0x06, 0x06, 0x3E, 0x66, 0x66, 0x3B, 0x00],   # U+0062 (b)
-    [ 0x00, 0x00, 0x1E, 0x33, 0x03, 0x33, 0x1E, 0x00],   # U+0063 (c)
-    [ 0x38, 0x30, 0x30, 0x3e, 0x33, 0x33, 0x6E, 0x00],   # U+0064 (d)
-    [ 0x00, 0x00, 0x1E, 0x33, 0x3f, 0x03, 0x1E, 0x00],   # U+0065 (e)
-    [ 0x1C, 0x36, 0x06, 0x0f, 0x06, 0x06, 0x0F, 0x00],   # U+0066 (f)
-    [ 0x00, 0x00, 0x6E, 0x33, 0x33, 0x3E, 0x30, 0x1F],   # U+0067 (g)
-    [ 0x07, 0x06, 0x36, 0x6E, 0x66, 0x66, 0x67, 0x00],   # U+0068 (h)
-    [ 0x0C, 0x00, 0x0E, 0x0C, 0x0C, 0x0C, 0x1E, 0x00],   # U+0069 (i)
-    [ 0x30, 0x00, 0x30, 0x30, 0x30, 0x33, 0x33, 0x1E],   # U+006A (j)
-    [ 0x07, 0x06, 0x66, 0x36, 0x1E, 0x36, 0x67, 0x00],   # U+006B (k)
-    [ 0x0E, 0x0C, 0x0C, 0x0C, 0x0C, 0x0C, 0x1E, 0x00],   # U+006C (l)
-    [ 0x00, 0x00, 0x33, 0x7F, 0x7F, 0x6B, 0x63, 0x00],   # U+006D (m)
-    [ 0x00, 0x00, 0x1F, 0x33, 0x33, 0x33, 0x33, 0x00],   # U+006E (n)
-    [ 0x00, 0x00, 0x1E, 0x33, 0x33, 0x33, 0x1E, 0x00],   # U+006F (o)
-    [ 0x00, 0x00, 0x3B, 0x66, 0x66, 0x3E, 0x06, 0x0F],   # U+0070 (p)
-    [ 0x00, 0x00, 0x6E, 0x33, 0x33, 0x3E, 0x30, 0x78],   # U+0071 (q)
-    [ 0x00, 0x00, 0x3B, 0x6E, 0x66, 0x06, 0x0F, 0x00],   # U+0072 (r)
-    [ 0x00, 0x00, 0x3E, 0x03, 0x1E, 0x30, 0x1F, 0x00],   # U+0073 (s)
-    [ 0x08, 0x0C, 0x3E, 0x0C, 0x0C, 0x2C, 0x18, 0x00],   # U+0074 (t)
-    [ 0x00, 0x00, 0x33, 0x33, 0x33, 0x33, 0x6E, 0x00],   # U+0075 (u)
-    [ 0x00, 0x00, 0x33, 0x33, 0x33, 0x1E, 0x0C, 0x00],   # U+0076 (v)
-    [ 0x00, 0x00, 0x63, 0x6B, 0x7F, 0x7F, 0x36, 0x00],   # U+0077 (w)
-    [ 0x00, 0x00, 0x63, 0x36, 0x1C, 0x36, 0x63, 0x00],   # U+0078 (x)
-    [ 0x00, 0x00, 0x33, 0x33, 0x33, 0x3E, 0x30, 0x1F],   # U+0079 (y)
-    [ 0x00, 0x00, 0x3F, 0x19, 0x0C, 0x26, 0x3F, 0x00],   # U+007A (z)
-    [ 0x38, 0x0C, 0x0C, 0x07, 0x0C, 0x0C, 0x38, 0x00],   # U+007B ([)
-    [ 0x18, 0x18, 0x18, 0x00, 0x18, 0x18, 0x18, 0x00],   # U+007C (|)
-    [ 0x07, 0x0C, 0x0C, 0x38, 0x0C, 0x0C, 0x07, 0x00],   # U+007D (])
-    [ 0x6E, 0x3B, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00],   # U+007E (~)
-    [ 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00] ]   # U+007F
+# font8x8_basic, stored column-major so no conversion is needed at runtime
+# Each character is 8 bytes, one byte per column from left to right
+# Bit 0 of a column byte is the top row, bit 7 is the bottom row
+# The table was built once from the row-major font8x8_basic by
+# transposing each glyph, the adjacent literals compile to one 1 KB bytes object
+# that can be frozen into flash
 
+font8x8_columns = (
+    b'\x00\x00\x00\x00\x00\x00\x00\x00'   # U+0000 (nul)
+    b'\x00\x00\x00\x00\x00\x00\x00\x00'   # U+0001
+    b'\x00\x00\x00\x00\x00\x00\x00\x00'   # U+0002
+    b'\x00\x00\x00\x00\x00\x00\x00\x00'   # U+0003
+    b'\x00\x00\x00\x00\x00\x00\x00\x00'   # U+0004
+    b'\x00\x00\x00\x00\x00\x00\x00\x00'   # U+0005
+    b'\x00\x00\x00\x00\x00\x00\x00\x00'   # U+0006
+    b'\x00\x00\x00\x00\x00\x00\x00\x00'   # U+0007
+    b'\x00\x00\x00\x00\x00\x00\x00\x00'   # U+0008
+    b'\x00\x00\x00\x00\x00\x00\x00\x00'   # U+0009
+    b'\x00\x00\x00\x00\x00\x00\x00\x00'   # U+000A
+    b'\x00\x00\x00\x00\x00\x00\x00\x00'   # U+000B
+    b'\x00\x00\x00\x00\x00\x00\x00\x00'   # U+000C
+    b'\x00\x00\x00\x00\x00\x00\x00\x00'   # U+000D
+    b'\x00\x00\x00\x00\x00\x00\x00\x00'   # U+000E
+    b'\x00\x00\x00\x00\x00\x00\x00\x00'   # U+000F
+    b'\x00\x00\x00\x00\x00\x00\x00\x00'   # U+0010
+    b'\x00\x00\x00\x00\x00\x00\x00\x00'   # U+0011
+    b'\x00\x00\x00\x00\x00\x00\x00\x00'   # U+0012
+    b'\x00\x00\x00\x00\x00\x00\x00\x00'   # U+0013
+    b'\x00\x00\x00\x00\x00\x00\x00\x00'   # U+0014
+    b'\x00\x00\x00\x00\x00\x00\x00\x00'   # U+0015
+    b'\x00\x00\x00\x00\x00\x00\x00\x00'   # U+0016
+    b'\x00\x00\x00\x00\x00\x00\x00\x00'   # U+0017
+    b'\x00\x00\x00\x00\x00\x00\x00\x00'   # U+0018
+    b'\x00\x00\x00\x00\x00\x00\x00\x00'   # U+0019
+    b'\x00\x00\x00\x00\x00\x00\x00\x00'   # U+001A
+    b'\x00\x00\x00\x00\x00\x00\x00\x00'   # U+001B
+    b'\x00\x00\x00\x00\x00\x00\x00\x00'   # U+001C
+    b'\x00\x00\x00\x00\x00\x00\x00\x00'   # U+001D
+    b'\x00\x00\x00\x00\x00\x00\x00\x00'   # U+001E
+    b'\x00\x00\x00\x00\x00\x00\x00\x00'   # U+001F
+    b'\x00\x00\x00\x00\x00\x00\x00\x00'   # U+0020 (space)
+    b'\x00\x00\x06\x5f\x5f\x06\x00\x00'   # U+0021 (!)
+    b'\x00\x03\x03\x00\x03\x03\x00\x00'   # U+0022 (")
+    b'\x14\x7f\x7f\x14\x7f\x7f\x14\x00'   # U+0023 (#)
+    b'\x24\x2e\x6b\x6b\x3a\x12\x00\x00'   # U+0024 ($)
+    b'\x46\x66\x30\x18\x0c\x66\x62\x00'   # U+0025 (%)
+    b'\x30\x7a\x4f\x5d\x37\x7a\x48\x00'   # U+0026 (&)
+    b'\x04\x07\x03\x00\x00\x00\x00\x00'   # U+0027 (')
+    b'\x00\x1c\x3e\x63\x41\x00\x00\x00'   # U+0028 (()
+    b'\x00\x41\x63\x3e\x1c\x00\x00\x00'   # U+0029 ())
+    b'\x08\x2a\x3e\x1c\x1c\x3e\x2a\x08'   # U+002A (*)
+    b'\x08\x08\x3e\x3e\x08\x08\x00\x00'   # U+002B (+)
+    b'\x00\x80\xe0\x60\x00\x00\x00\x00'   # U+002C (,)
+    b'\x08\x08\x08\x08\x08\x08\x00\x00'   # U+002D (-)
+    b'\x00\x00\x60\x60\x00\x00\x00\x00'   # U+002E (.)
+    b'\x60\x30\x18\x0c\x06\x03\x01\x00'   # U+002F (/)
+    b'\x3e\x7f\x71\x59\x4d\x7f\x3e\x00'   # U+0030 (0)
+    b'\x40\x42\x7f\x7f\x40\x40\x00\x00'   # U+0031 (1)
+    b'\x62\x73\x59\x49\x6f\x66\x00\x00'   # U+0032 (2)
+    b'\x22\x63\x49\x49\x7f\x36\x00\x00'   # U+0033 (3)
+    b'\x18\x1c\x16\x53\x7f\x7f\x50\x00'   # U+0034 (4)
+    b'\x27\x67\x45\x45\x7d\x39\x00\x00'   # U+0035 (5)
+    b'\x3c\x7e\x4b\x49\x79\x30\x00\x00'   # U+0036 (6)
+    b'\x03\x03\x71\x79\x0f\x07\x00\x00'   # U+0037 (7)
+    b'\x36\x7f\x49\x49\x7f\x36\x00\x00'   # U+0038 (8)
+    b'\x06\x4f\x49\x69\x3f\x1e\x00\x00'   # U+0039 (9)
+    b'\x00\x00\x66\x66\x00\x00\x00\x00'   # U+003A (:)
+    b'\x00\x80\xe6\x66\x00\x00\x00\x00'   # U+003B (;)
+    b'\x08\x1c\x36\x63\x41\x00\x00\x00'   # U+003C (<)
+    b'\x24\x24\x24\x24\x24\x24\x00\x00'   # U+003D (=)
+    b'\x00\x41\x63\x36\x1c\x08\x00\x00'   # U+003E (>)
+    b'\x02\x03\x51\x59\x0f\x06\x00\x00'   # U+003F (?)
+    b'\x3e\x7f\x41\x5d\x5d\x1f\x1e\x00'   # U+0040 (@)
+    b'\x7c\x7e\x13\x13\x7e\x7c\x00\x00'   # U+0041 (A)
+    b'\x41\x7f\x7f\x49\x49\x7f\x36\x00'   # U+0042 (B)
+    b'\x1c\x3e\x63\x41\x41\x63\x22\x00'   # U+0043 (C)
+    b'\x41\x7f\x7f\x41\x63\x3e\x1c\x00'   # U+0044 (D)
+    b'\x41\x7f\x7f\x49\x5d\x41\x63\x00'   # U+0045 (E)
+    b'\x41\x7f\x7f\x49\x1d\x01\x03\x00'   # U+0046 (F)
+    b'\x1c\x3e\x63\x41\x51\x73\x72\x00'   # U+0047 (G)
+    b'\x7f\x7f\x08\x08\x7f\x7f\x00\x00'   # U+0048 (H)
+    b'\x00\x41\x7f\x7f\x41\x00\x00\x00'   # U+0049 (I)
+    b'\x30\x70\x40\x41\x7f\x3f\x01\x00'   # U+004A (J)
+    b'\x41\x7f\x7f\x08\x1c\x77\x63\x00'   # U+004B (K)
+    b'\x41\x7f\x7f\x41\x40\x60\x70\x00'   # U+004C (L)
+    b'\x7f\x7f\x0e\x1c\x0e\x7f\x7f\x00'   # U+004D (M)
+    b'\x7f\x7f\x06\x0c\x18\x7f\x7f\x00'   # U+004E (N)
+    b'\x1c\x3e\x63\x41\x63\x3e\x1c\x00'   # U+004F (O)
+    b'\x41\x7f\x7f\x49\x09\x0f\x06\x00'   # U+0050 (P)
+    b'\x1e\x3f\x21\x71\x7f\x5e\x00\x00'   # U+0051 (Q)
+    b'\x41\x7f\x7f\x09\x19\x7f\x66\x00'   # U+0052 (R)
+    b'\x26\x6f\x4d\x59\x73\x32\x00\x00'   # U+0053 (S)
+    b'\x03\x41\x7f\x7f\x41\x03\x00\x00'   # U+0054 (T)
+    b'\x7f\x7f\x40\x40\x7f\x7f\x00\x00'   # U+0055 (U)
+    b'\x1f\x3f\x60\x60\x3f\x1f\x00\x00'   # U+0056 (V)
+    b'\x7f\x7f\x30\x18\x30\x7f\x7f\x00'   # U+0057 (W)
+    b'\x43\x67\x3c\x18\x3c\x67\x43\x00'   # U+0058 (X)
+    b'\x07\x4f\x78\x78\x4f\x07\x00\x00'   # U+0059 (Y)
+    b'\x47\x63\x71\x59\x4d\x67\x73\x00'   # U+005A (Z)
+    b'\x00\x7f\x7f\x41\x41\x00\x00\x00'   # U+005B ([)
+    b'\x01\x03\x06\x0c\x18\x30\x60\x00'   # U+005C (\)
+    b'\x00\x41\x41\x7f\x7f\x00\x00\x00'   # U+005D (])
+    b'\x08\x0c\x06\x03\x06\x0c\x08\x00'   # U+005E (^)
+    b'\x80\x80\x80\x80\x80\x80\x80\x80'   # U+005F (_)
+    b'\x00\x00\x03\x07\x04\x00\x00\x00'   # U+0060 (`)
+    b'\x20\x74\x54\x54\x3c\x78\x40\x00'   # U+0061 (a)
+    b'\x41\x7f\x3f\x48\x48\x78\x30\x00'   # U+0062 (b)
+    b'\x38\x7c\x44\x44\x6c\x28\x00\x00'   # U+0063 (c)
+    b'\x30\x78\x48\x49\x3f\x7f\x40\x00'   # U+0064 (d)
+    b'\x38\x7c\x54\x54\x5c\x18\x00\x00'   # U+0065 (e)
+    b'\x48\x7e\x7f\x49\x03\x02\x00\x00'   # U+0066 (f)
+    b'\x98\xbc\xa4\xa4\xf8\x7c\x04\x00'   # U+0067 (g)
+    b'\x41\x7f\x7f\x08\x04\x7c\x78\x00'   # U+0068 (h)
+    b'\x00\x44\x7d\x7d\x40\x00\x00\x00'   # U+0069 (i)
+    b'\x60\xe0\x80\x80\xfd\x7d\x00\x00'   # U+006A (j)
+    b'\x41\x7f\x7f\x10\x38\x6c\x44\x00'   # U+006B (k)
+    b'\x00\x41\x7f\x7f\x40\x00\x00\x00'   # U+006C (l)
+    b'\x7c\x7c\x18\x38\x1c\x7c\x78\x00'   # U+006D (m)
+    b'\x7c\x7c\x04\x04\x7c\x78\x00\x00'   # U+006E (n)
+    b'\x38\x7c\x44\x44\x7c\x38\x00\x00'   # U+006F (o)
+    b'\x84\xfc\xf8\xa4\x24\x3c\x18\x00'   # U+0070 (p)
+    b'\x18\x3c\x24\xa4\xf8\xfc\x84\x00'   # U+0071 (q)
+    b'\x44\x7c\x78\x4c\x04\x1c\x18\x00'   # U+0072 (r)
+    b'\x48\x5c\x54\x54\x74\x24\x00\x00'   # U+0073 (s)
+    b'\x00\x04\x3e\x7f\x44\x24\x00\x00'   # U+0074 (t)
+    b'\x3c\x7c\x40\x40\x3c\x7c\x40\x00'   # U+0075 (u)
+    b'\x1c\x3c\x60\x60\x3c\x1c\x00\x00'   # U+0076 (v)
+    b'\x3c\x7c\x70\x38\x70\x7c\x3c\x00'   # U+0077 (w)
+    b'\x44\x6c\x38\x10\x38\x6c\x44\x00'   # U+0078 (x)
+    b'\x9c\xbc\xa0\xa0\xfc\x7c\x00\x00'   # U+0079 (y)
+    b'\x4c\x64\x74\x5c\x4c\x64\x00\x00'   # U+007A (z)
+    b'\x08\x08\x3e\x77\x41\x41\x00\x00'   # U+007B ([)
+    b'\x00\x00\x00\x77\x77\x00\x00\x00'   # U+007C (|)
+    b'\x41\x41\x77\x3e\x08\x08\x00\x00'   # U+007D (])
+    b'\x02\x03\x01\x03\x02\x03\x01\x00'   # U+007E (~)
+    b'\x00\x00\x00\x00\x00\x00\x00\x00'   # U+007F
+)
+
+GLYPH_SIZE = 8
+
+_font = memoryview(font8x8_columns)
+
+# O(1) access to the 8 column bytes of a character, characters outside ASCII are blank
+def glyph(c):
+    n = ord(c)
+    if n > 0x7F:
+        n = 0
+    return _font[n * GLYPH_SIZE:(n + 1) * GLYPH_SIZE]
+
+# 8x8 list of on/off pixels, w[row][col]
 def matrix_in_binary(c):
+    g = glyph(c)
     w = []
-    for f in font8x8_basic[ord(c)]:
-        n = [0,0,0,0,0,0,0,0]
-        b = bin(f).split('b')[1]
-        i = 7
-        j = len(b) - 1
-        if i > 7:
-            i = 7
-        while i >= 0 and j >=0:
-            n[i] = int(b[j])
-            i -= 1
-            j -= 1
-        i = 0
-        j = 7
-        while i < 4:
-            temp = n[i]
-            n[i] = n[j]
-            n[j] = temp
-            i += 1
-            j -= 1
-        w.append(n)
-    return w
\ No newline at end of file
+    for row in range(GLYPH_SIZE):
+        w.append([(g[col] >> row) & 1 for col in range(GLYPH_SIZE)])
+    return w
+
+# Render a whole string once as column bytes, with a trailing blank character
+# so the last letter can scroll off the screen
+def textbuffer(w):
+    buf = bytearray((len(w) + 1) * GLYPH_SIZE)
+    i = 0
+    for l in w:
+        buf[i:i + GLYPH_SIZE] = glyph(l)
+        i += GLYPH_SIZE
+    return buf
\ No newline at end of file
@@ -0,0 +1,88 @@
+import uasyncio as asyncio
+import eightbyeight
+import matrixrows
+
+# 8x8 LED matrix driven by a background refresh task
+# Rows are active high, columns are active low (a lit pixel has its row high and its column low)
+# The frame is a column-byte buffer and an offset, bit 0 of a column byte is the top row
+# Drawing only swaps the buffer/offset the refresh task reads, nothing is copied
+# The refresh task recomputes the row masks when the frame changes, each row is one GPIO write
+
+ROW_PINS = [26, 18, 9, 20, 2, 8, 3, 6]
+COL_PINS = [19, 4, 5, 22, 7, 21, 17, 16]
+
+
+class AsyncMatrix8x8:
+    def __init__(self, row_pins=ROW_PINS, col_pins=COL_PINS, row_ms=2):
+        self.matrix = matrixrows.MatrixRows(row_pins, col_pins)
+        self.row_ms = row_ms
+        self._buffer = bytearray(len(col_pins))
+        self._offset = 0
+        self._dirty = True
+        self._task = None
+        self._running = False
+
+    def _clear(self):
+        self.matrix.off()
+
+    def show(self, buffer, offset=0):
+        # display len(cols) column bytes of buffer starting at offset
+        self._buffer = buffer
+        self._offset = offset
+        self._dirty = True
+
+    def blank(self):
+        self.show(bytearray(len(self.matrix.cols)))
+
+    async def _run(self):
+        try:
+            while self._running:
+                for row in range(len(self.matrix.rows)):
+                    if self._dirty:
+                        self._dirty = False
+                        self.matrix.load(self._buffer, self._offset)
+
+                    # short on-time for this row
+                    self.matrix.paint(row)
+                    await asyncio.sleep_ms(self.row_ms)
+                    self.matrix.off()
+        finally:
+            self._clear()
+
+    def start(self):
+        if self._task is None:
+            self._running = True
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._running = False
+            await self._task
+            self._task = None
+        self._clear()
+
+    async def scroll(self, text, step_ms=80):
+        # render once, then move the window one column per step
+        buf = eightbyeight.textbuffer(" {0}".format(text))
+        for i in range(len(buf) - len(self.matrix.cols)):
+            self.show(buf, i)
+            await asyncio.sleep_ms(step_ms)
+        self.blank()
+
+
+async def demo():
+    matrix = AsyncMatrix8x8()
+    matrix.start()
+    try:
+        # other tasks keep running while the text scrolls
+        await matrix.scroll("Hello from asyncio")
+        matrix.show(eightbyeight.glyph("A"))
+        await asyncio.sleep(2)
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+    finally:
+        await matrix.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(demo())
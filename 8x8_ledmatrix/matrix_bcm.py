@@ -0,0 +1,122 @@
+from machine import Timer
+import array
+import time
+import eightbyeight
+import matrixrows
+
+# Brightness levels on the 8x8 LED matrix with binary code modulation (BCM)
+# Each pixel has a level from 0 to 2**depth - 1, stored as depth bit-planes of column bytes
+# A timer ticks every base_us, every row shows plane p for 2**p ticks, so the on-time of a
+# pixel is proportional to its level
+# One frame takes rows * (2**depth - 1) ticks, for example 8 * 15 * 100us = 12ms (83 Hz) at depth 4
+# show() rebuilds the row masks of every plane into a back buffer and swaps it in,
+# the timer callback only indexes the masks and writes one GPIO value
+
+ROW_PINS = [26, 18, 9, 20, 2, 8, 3, 6]
+COL_PINS = [19, 4, 5, 22, 7, 21, 17, 16]
+
+
+class BCMMatrix8x8:
+    def __init__(self, row_pins=ROW_PINS, col_pins=COL_PINS, depth=4, base_us=100):
+        if not 1 <= depth <= 4:
+            raise ValueError("depth must be 1 to 4 bits")
+        self.matrix = matrixrows.MatrixRows(row_pins, col_pins)
+        self.depth = depth
+        self.base_us = base_us
+        self.nrows = len(row_pins)
+        self.ncols = len(col_pins)
+        self.maxlevel = (1 << depth) - 1
+        self.planes = bytearray(depth * self.ncols)
+        self._masks = array.array("I", [self.matrix.allcols for _ in range(depth * self.nrows)])
+        self._back = array.array("I", self._masks)
+
+        self._timer = None
+        self._row = 0
+        self._plane = 0
+        self._count = 1
+        self.ticks = 0
+        self._tick_cb = self._tick
+
+    def frame_hz(self):
+        return 1_000_000 / (self.nrows * self.maxlevel * self.base_us)
+
+    def clear(self):
+        for i in range(len(self.planes)):
+            self.planes[i] = 0
+
+    def set_pixel(self, col, row, level):
+        if level > self.maxlevel:
+            level = self.maxlevel
+        rowbit = 1 << row
+        i = col
+        for p in range(self.depth):
+            if level & (1 << p):
+                self.planes[i] |= rowbit
+            else:
+                self.planes[i] &= ~rowbit
+            i += self.ncols
+
+    # draw column bytes (for example eightbyeight.glyph) at one brightness level
+    def draw(self, buffer, level, offset=0):
+        for col in range(self.ncols):
+            bits = buffer[offset + col]
+            for row in range(self.nrows):
+                self.set_pixel(col, row, level if bits & (1 << row) else 0)
+
+    def show(self):
+        back = self._back
+        for p in range(self.depth):
+            self.matrix.load(self.planes, p * self.ncols, back, p * self.nrows)
+        self._back = self._masks
+        self._masks = back
+
+    def _tick(self, t):
+        self.ticks += 1
+        self._count -= 1
+        if self._count > 0:
+            return
+        self._plane += 1
+        if self._plane == self.depth:
+            self._plane = 0
+            self._row += 1
+            if self._row == self.nrows:
+                self._row = 0
+        self.matrix.write(self._masks[self._plane * self.nrows + self._row])
+        self._count = 1 << self._plane
+
+    def start(self):
+        if self._timer is None:
+            self.ticks = 0
+            self._timer = Timer(mode=Timer.PERIODIC, freq=1_000_000 // self.base_us, callback=self._tick_cb)
+
+    def stop(self):
+        if self._timer is not None:
+            self._timer.deinit()
+            self._timer = None
+        self.matrix.off()
+
+
+def main():
+    display = BCMMatrix8x8()
+    display.start()
+    try:
+        # horizontal gradient, one level per column
+        for col in range(display.ncols):
+            for row in range(display.nrows):
+                display.set_pixel(col, row, col * display.maxlevel // (display.ncols - 1))
+        display.show()
+        time.sleep(2)
+
+        # fade a letter in and out
+        g = eightbyeight.glyph("A")
+        for level in list(range(display.maxlevel + 1)) + list(range(display.maxlevel, -1, -1)):
+            display.draw(g, level)
+            display.show()
+            time.sleep(0.1)
+    except KeyboardInterrupt:
+        print("Program shut down by user")
+    finally:
+        display.stop()
+
+if __name__ == "__main__":
+    main()
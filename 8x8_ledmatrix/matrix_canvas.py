@@ -0,0 +1,89 @@
+import uasyncio as asyncio
+import framebuf
+import eightbyeight
+import matrix_async
+
+# Virtual canvas spanning N chained 8x8 panels, left to right
+# The canvas is a MONO_VLSB FrameBuffer, so every byte is one column with bit 0 at the top,
+# the same column-byte layout the matrix drivers read, and panel i is bytes 8*i to 8*i+7
+# All FrameBuffer drawing works on the canvas (fill, pixel, text, blit, scroll, ...)
+# update() compares each panel with what was last pushed and only calls show() on
+# the panels that changed
+# A panel is any object with show(buffer, offset), for example AsyncMatrix8x8
+
+PANEL_SIZE = 8
+
+
+class MatrixCanvas(framebuf.FrameBuffer):
+    def __init__(self, panels):
+        width = len(panels) * PANEL_SIZE
+        buffer = bytearray(width)
+        super().__init__(buffer, width, PANEL_SIZE, framebuf.MONO_VLSB)
+        self.panels = panels
+        self.width = width
+        self.height = PANEL_SIZE
+        self.buffer = buffer
+        self._shown = bytearray(width)
+        self._view = memoryview(buffer)
+        self._pushall = True
+        self.pushed = 0
+
+    # draw text with the eightbyeight font, clipped to the canvas
+    def glyphs(self, text, x=0):
+        for l in text:
+            if x >= self.width:
+                break
+            g = eightbyeight.glyph(l)
+            for col in range(PANEL_SIZE):
+                if 0 <= x + col < self.width:
+                    self.buffer[x + col] = g[col]
+            x += PANEL_SIZE
+
+    def _changed(self, offset):
+        for i in range(offset, offset + PANEL_SIZE):
+            if self.buffer[i] != self._shown[i]:
+                return True
+        return False
+
+    # push the dirty panels, returns how many were pushed
+    def update(self):
+        count = 0
+        for p in range(len(self.panels)):
+            offset = p * PANEL_SIZE
+            if self._pushall or self._changed(offset):
+                self._shown[offset:offset + PANEL_SIZE] = self._view[offset:offset + PANEL_SIZE]
+                self.panels[p].show(self.buffer, offset)
+                count += 1
+        self._pushall = False
+        self.pushed += count
+        return count
+
+
+async def demo():
+    # add one driver per panel, left to right
+    panels = [matrix_async.AsyncMatrix8x8()]
+    for p in panels:
+        p.start()
+    canvas = MatrixCanvas(panels)
+    try:
+        canvas.fill(0)
+        canvas.glyphs("Hi")
+        canvas.update()
+        await asyncio.sleep(1)
+
+        # scroll the canvas left until it is blank, only changed panels are pushed
+        for _ in range(canvas.width):
+            canvas.scroll(-1, 0)
+            canvas.fill_rect(canvas.width - 1, 0, 1, canvas.height, 0)
+            canvas.update()
+            await asyncio.sleep_ms(80)
+        print("panel pushes = {0}".format(canvas.pushed))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+    finally:
+        for p in panels:
+            await p.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(demo())
@@ -0,0 +1,71 @@
+from machine import Pin
+import array
+import sys
+
+# Row-at-once output for an 8x8 LED matrix wired straight to GPIO
+# Rows are active high, columns are active low
+# load() turns a column-byte frame into one GPIO mask per row, paint(row) then
+# lights a whole row with two writes to the RP2040 SIO set/clear registers
+# instead of one Pin call per column
+# Other ports fall back to Pin calls from the same masks
+
+SIO_GPIO_OUT_SET = const(0xd0000014)
+SIO_GPIO_OUT_CLR = const(0xd0000018)
+
+if sys.platform == "rp2":
+    from machine import mem32
+else:
+    mem32 = None
+
+
+class MatrixRows:
+    def __init__(self, row_pins, col_pins):
+        self.rows = [Pin(p, Pin.OUT) for p in row_pins]
+        self.cols = [Pin(p, Pin.OUT) for p in col_pins]
+        self.rowbits = [1 << p for p in row_pins]
+        self.colbits = [1 << p for p in col_pins]
+        self.allrows = 0
+        for b in self.rowbits:
+            self.allrows |= b
+        self.allcols = 0
+        for b in self.colbits:
+            self.allcols |= b
+        self.managed = self.allrows | self.allcols
+        self.masks = array.array("I", [self.allcols for _ in row_pins])
+        self.off()
+
+    # compute the GPIO value of every row for len(cols) columns of buffer from offset
+    # into masks[start:start + len(rows)], by default the masks used by paint()
+    def load(self, buffer, offset=0, masks=None, start=0):
+        if masks is None:
+            masks = self.masks
+        for row in range(len(self.rows)):
+            rowbit = 1 << row
+            lit = 0
+            i = offset
+            for b in self.colbits:
+                if buffer[i] & rowbit:
+                    lit |= b
+                i += 1
+            masks[start + row] = self.rowbits[row] | (self.allcols & ~lit)
+
+    def write(self, value):
+        if mem32 is not None:
+            # set first so the transient state can only have fewer pixels lit
+            mem32[SIO_GPIO_OUT_SET] = value
+            mem32[SIO_GPIO_OUT_CLR] = self.managed & ~value
+        else:
+            for i in range(len(self.rows)):
+                if not value & self.rowbits[i]:
+                    self.rows[i].value(0)
+            for i in range(len(self.cols)):
+                self.cols[i].value(1 if value & self.colbits[i] else 0)
+            for i in range(len(self.rows)):
+                if value & self.rowbits[i]:
+                    self.rows[i].value(1)
+
+    def paint(self, row):
+        self.write(self.masks[row])
+
+    def off(self):
+        self.write(self.allcols)
@@ -6,11 +6,11 @@ ADCMaxVoltPin = 27 #GP27
 PicoMaxADCVoltage = 3.3
 ADC16BitRange = 65536
 LEDMeterRange = 10
-ClearRegister = [0,0,0,0,0,0,0,0,0,0]
 
 def main():
     batterySizeL = 1.5
     batterySizeH = 3.0
+    r = None
 
     try:
         batteryLowVoltage = ADC(ADCLowVoltPin)
@@ -19,7 +19,7 @@ def main():
 
         r = shiftregister.shiftregister()
         r.set_registerSize(LEDMeterRange)
-        r.register = ClearRegister
+        r.set_bits(0)
         r.set_register()
         
 
@@ -37,20 +37,17 @@ def main():
                 LEDdisplay = LEDMeterRange
 
             #set the shift register
-            i = 0
-            while i < LEDMeterRange:
-                if i < LEDdisplay:
-                    r.register[i] = 1
-                else:
-                    r.register[i] = 0
-                i += 1
+            r.set_bar(LEDdisplay)
             #print("LEDdisplay = {0}, batteryVoltage voltage = {1}, register = {2}".format(LEDdisplay, batteryLowV, r.register))
-            r.set_register()
+            #only clock the shift register when the bar graph changes
+            r.write_if_changed()
 
     except KeyboardInterrupt:
         print("stopping program")
 
     finally:
+        if r is not None:
+            print("shift register writes = {0}, skipped = {1}".format(r.writes, r.skipped))
         print("Graceful exit")
 
 if __name__ == '__main__':
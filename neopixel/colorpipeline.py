@@ -0,0 +1,107 @@
+import array
+import micropython
+
+# Gamma corrected, temporally dithered colour output for WS2812 and NeoPixel LEDs
+# Linear brightness scaling throws away most of the low levels, so dim colours collapse and
+# fades show visible steps. Here each colour byte goes through a table of gamma corrected
+# values in 8.8 fixed point, already scaled by brightness. The 8 fractional bits are kept
+# per LED and channel and added to the next frame, so a level between two output values
+# is shown by alternating them. Dithering needs frames to be sent continuously (for example
+# at 100 Hz or more), a single frame is just the rounded value.
+# Input pixels are packed GRB words, the same format as WS2812.ar
+# Nothing is allocated per frame, the tables and error buffer are made once
+
+GAMMA = 2.2
+
+# GRB words, colour in the top 24 bits, for the WS2812 PIO program
+@micropython.viper
+def _words(src, dst, lut, err, n: int):
+    s = ptr32(src)
+    d = ptr32(dst)
+    l = ptr16(lut)
+    e = ptr8(err)
+    j = 0
+    for i in range(n):
+        c = s[i]
+        v = l[(c >> 16) & 0xFF] + e[j]
+        e[j] = v & 0xFF
+        g = v >> 8
+        v = l[(c >> 8) & 0xFF] + e[j + 1]
+        e[j + 1] = v & 0xFF
+        r = v >> 8
+        v = l[c & 0xFF] + e[j + 2]
+        e[j + 2] = v & 0xFF
+        b = v >> 8
+        d[i] = (g << 24) | (r << 16) | (b << 8)
+        j += 3
+
+# G, R, B bytes, the buffer layout of neopixel.NeoPixel with bpp=3
+@micropython.viper
+def _bytes(src, dst, lut, err, n: int):
+    s = ptr32(src)
+    d = ptr8(dst)
+    l = ptr16(lut)
+    e = ptr8(err)
+    j = 0
+    for i in range(n):
+        c = s[i]
+        v = l[(c >> 16) & 0xFF] + e[j]
+        e[j] = v & 0xFF
+        d[j] = v >> 8
+        v = l[(c >> 8) & 0xFF] + e[j + 1]
+        e[j + 1] = v & 0xFF
+        d[j + 1] = v >> 8
+        v = l[c & 0xFF] + e[j + 2]
+        e[j + 2] = v & 0xFF
+        d[j + 2] = v >> 8
+        j += 3
+
+class ColorPipeline():
+    def __init__(self, led_count, brightness = 0.5, gamma = GAMMA, dither = True):
+        self.led_count = led_count
+        self.gamma = gamma
+        self.dither = dither
+        self.lut = array.array("H", [0 for _ in range(256)])
+        self.err = bytearray(led_count * 3)
+        self.brightness = brightness
+
+    # the table is rebuilt only when brightness changes
+    @property
+    def brightness(self):
+        return self._brightness
+
+    @brightness.setter
+    def brightness(self, value):
+        self._brightness = value
+        for i in range(256):
+            v = int((i / 255) ** self.gamma * value * 0xFF00 + 0.5)
+            if not self.dither:
+                v = (v + 0x80) & 0xFF00
+            self.lut[i] = min(0xFF00, v)
+
+    # the viper loops write through raw pointers, so sizes are checked here
+    def _count(self, src, n):
+        if n is None:
+            n = self.led_count
+        if not 0 <= n <= self.led_count:
+            raise ValueError("{0} pixels, pipeline is for {1}".format(n, self.led_count))
+        if len(src) < n:
+            raise ValueError("source has {0} pixels, {1} needed".format(len(src), n))
+        return n
+
+    def to_words(self, src, dst, n=None):
+        n = self._count(src, n)
+        if len(dst) < n:
+            raise ValueError("destination has {0} words, {1} needed".format(len(dst), n))
+        _words(src, dst, self.lut, self.err, n)
+
+    def to_bytes(self, src, dst, n=None):
+        n = self._count(src, n)
+        if len(dst) < 3 * n:
+            raise ValueError("destination has {0} bytes, {1} needed".format(len(dst), 3 * n))
+        _bytes(src, dst, self.lut, self.err, n)
+
+    # write src into a neopixel.NeoPixel buffer and send it
+    def show_neopixel(self, src, np):
+        self.to_bytes(src, np.buf)
+        np.write()
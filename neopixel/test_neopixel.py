@@ -1,32 +1,41 @@
 import machine
 import neopixel
 import time
+import array
+from colorpipeline import ColorPipeline
 
 # Pin where your NeoPixel data line is connected
 # 23 is the pin on the cheap rp2040 boards from china
 
-MAX_BRIGHTNESS = 32  # Set to a value between 0 and 255
+BRIGHTNESS = 32 / 255  # Set to a value between 0 and 1
+REFRESH_MS = 10  # dithering needs frames to keep coming
 
 pin = machine.Pin(23)   # change to your pin
 n = 1                  # number of pixels
 
 np = neopixel.NeoPixel(pin, n)
+# colours are given at full scale, the pipeline applies gamma, brightness and dithering
+pipeline = ColorPipeline(n, brightness=BRIGHTNESS)
+pixels = array.array("I", [0 for _ in range(n)])
+
+def show(color, seconds):
+    pixels[0] = (color[1]<<16) + (color[0]<<8) + color[2]
+    end = time.ticks_add(time.ticks_ms(), int(seconds * 1000))
+    while time.ticks_diff(end, time.ticks_ms()) > 0:
+        pipeline.show_neopixel(pixels, np)
+        time.sleep_ms(REFRESH_MS)
 
 # Red
-np[0] = (MAX_BRIGHTNESS, 0, 0)
-np.write()
-time.sleep(1)
+show((255, 0, 0), 1)
 
 # white
-np[0] = (MAX_BRIGHTNESS, MAX_BRIGHTNESS, MAX_BRIGHTNESS)
-np.write()
-time.sleep(1)
+show((255, 255, 255), 1)
 
 # blue
-np[0] = (0, 0, MAX_BRIGHTNESS)
-np.write()
-time.sleep(1)
+show((0, 0, 255), 1)
+
+# fade blue out, the low levels stay smooth
+for level in range(255, -1, -1):
+    show((0, 0, level), 0.01)
 
-np[0] = (0, 0, 0)
-np.write()
-time.sleep(1)
\ No newline at end of file
+show((0, 0, 0), 1)
@@ -0,0 +1,154 @@
+import array
+import asyncio
+import time
+
+# All LED fades of a light show run from one task
+# Active fades live in fixed size arrays (module, channel, step, steps, curve), one slot per fade
+# Every tick the task advances every fade, stages the new duty cycles on buffered PCA9685s
+# and flushes each chip once, so the task count, memory and I2C transactions stay bounded
+# however many LEDs are fading
+# A fade ramps up to its peak in `steps` ticks, then back down to off in `steps` ticks,
+# the same shape as the old one-task-per-LED fade()
+# The ramp is a precomputed curve of 12 bit duty cycles, so a step is one table lookup.
+# Curves are cached by (peak, steps, curve) and the least recently used one is dropped when
+# the cache is full. "gamma" ramps look even to the eye, "linear" is the old straight ramp
+
+TICK_MS = 10
+MAX_FADES = 64
+FREE = 0xFF
+CURVE_CACHE_SIZE = 16
+GAMMA = 2.2
+
+def percentage_to_duty_cycle(percentage):
+    return int((percentage / 100) * 0xFFFF)
+
+# up ramp of a fade, curve[i] is the 12 bit duty cycle after i + 1 steps
+def make_curve(peak, steps, curve):
+    if curve == "gamma":
+        return array.array("H", [int(peak * ((i + 1) / steps) ** GAMMA + 0.5) for i in range(steps)])
+    if curve == "linear":
+        return array.array("H", [peak * (i + 1) // steps for i in range(steps)])
+    raise ValueError("unknown fade curve: " + curve)
+
+class CurveCache:
+    def __init__(self, size=CURVE_CACHE_SIZE):
+        self.size = size
+        self.curves = {}
+        self.order = []  # keys, least recently used first
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, peak, steps, curve):
+        key = (peak, steps, curve)
+        ramp = self.curves.get(key)
+        if ramp is not None:
+            self.hits += 1
+            self.order.remove(key)
+            self.order.append(key)
+            return ramp
+        self.misses += 1
+        if len(self.order) >= self.size:
+            del self.curves[self.order.pop(0)]
+        ramp = make_curve(peak, steps, curve)
+        self.curves[key] = ramp
+        self.order.append(key)
+        return ramp
+
+class FadeEngine:
+    def __init__(self, pcas, tick_ms=TICK_MS, max_fades=MAX_FADES, curves=None):
+        self.pcas = pcas
+        for pca in pcas:
+            pca.buffered = True
+        self.tick_ms = tick_ms
+        self.module = bytearray([FREE] * max_fades)
+        self.channel = bytearray(max_fades)
+        self.step = array.array("H", [0] * max_fades)
+        self.steps = array.array("H", [0] * max_fades)
+        self.curve = [None] * max_fades
+        self.curves = CurveCache() if curves is None else curves
+        self.active = 0
+        self.dropped = 0
+        self._wake = asyncio.Event()
+        self._task = None
+
+    def __len__(self):
+        return len(self.pcas)
+
+    def _slot(self, module, ch):
+        # the slot already fading this channel, else a free one
+        free = -1
+        for i in range(len(self.module)):
+            m = self.module[i]
+            if m == module and self.channel[i] == ch:
+                return i
+            if m == FREE and free < 0:
+                free = i
+        return free
+
+    # fade channel ch of module up to brightness percent and back, taking sleeplen each way
+    def fade(self, module, ch, brightness, sleeplen=0.25, curve="gamma"):
+        i = self._slot(module, ch)
+        if i < 0:
+            self.dropped += 1
+            return
+        if self.module[i] == FREE:
+            self.active += 1
+        self.module[i] = module
+        self.channel[i] = ch
+        self.step[i] = 0
+        steps = max(1, int(sleeplen * 1000 / self.tick_ms))
+        self.steps[i] = steps
+        self.curve[i] = self.curves.get(percentage_to_duty_cycle(brightness) >> 4, steps, curve)
+        self._wake.set()
+
+    # stop any fade on the channel and hold it at brightness percent from the next tick
+    def set(self, module, ch, brightness):
+        i = self._slot(module, ch)
+        if i >= 0 and self.module[i] != FREE:
+            self.module[i] = FREE
+            self.curve[i] = None
+            self.active -= 1
+        self.pcas[module].channels[ch].duty_cycle = percentage_to_duty_cycle(brightness)
+        self._wake.set()
+
+    def _tick(self):
+        for i in range(len(self.module)):
+            m = self.module[i]
+            if m == FREE:
+                continue
+            step = self.step[i] + 1
+            steps = self.steps[i]
+            k = step if step <= steps else 2 * steps - step
+            duty = self.curve[i][k - 1] << 4 if k else 0
+            self.pcas[m].channels[self.channel[i]].duty_cycle = duty
+            if step >= 2 * steps:
+                self.module[i] = FREE
+                self.curve[i] = None
+                self.active -= 1
+            else:
+                self.step[i] = step
+        for pca in self.pcas:
+            pca.flush()
+
+    async def run(self):
+        deadline = time.ticks_ms()
+        while True:
+            if self.active == 0:
+                # nothing fading, flush any set() values then sleep until there is work
+                for pca in self.pcas:
+                    pca.flush()
+                self._wake.clear()
+                await self._wake.wait()
+                deadline = time.ticks_ms()
+            self._tick()
+            deadline = time.ticks_add(deadline, self.tick_ms)
+            delay = time.ticks_diff(deadline, time.ticks_ms())
+            if delay > 0:
+                await asyncio.sleep_ms(delay)
+            else:
+                deadline = time.ticks_ms()
+                await asyncio.sleep_ms(0)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
@@ -14,12 +14,92 @@ servos, leds and motors.
 
 * Author(s): Radomir Dopieralski, Scott Shawcroft, Jose D. Montoya
 
+This copy adds buffered writes, :py:class:`PCA9685Bus`, ``I2C_PROFILES`` and staggered ON
+times. Install it on the board as ``micropython_pca9685/pca9685.py`` and import those
+names from ``micropython_pca9685.pca9685``.
+
 
 """
 
 import time
 from micropython_pca9685.i2c_helpers import RegisterStruct, StructArray
 
+_LED0_ON_L = 0x06
+_ALL_LED_ON_L = 0xFA
+_MODE1_ALLCALL = 0x01
+_MODE1_SLEEP = 0x10
+_MODE1_AI = 0x20
+_MODE1_RESTART = 0x80
+_MODE1_REG = 0x00
+_PRESCALE_REG = 0xFE
+_FULL = 0x1000
+
+I2C_PROFILES = {"standard": 100_000, "fast": 400_000, "fast_plus": 1_000_000}
+"""I2C bus clock in Hz for each speed mode the PCA9685 supports, for the ``freq`` of ``machine.I2C``."""
+
+
+def _pack_duty(buf, offset: int, value: int, phase: int = 0) -> None:
+    """Pack a 16 bit duty cycle into the 4 LEDn_ON/OFF bytes at ``buf[offset]``.
+    Uses the same full on / full off special cases as :py:attr:`PWMChannel.duty_cycle`.
+    The output turns on ``phase`` counts (0-4095) into the PWM period."""
+    if value == 0xFFFF:
+        on, off = _FULL, 0
+    elif value < 0x0010:
+        on, off = 0, _FULL
+    else:
+        on, off = phase, (phase + (value >> 4)) & 0x0FFF
+    buf[offset] = on & 0xFF
+    buf[offset + 1] = on >> 8
+    buf[offset + 2] = off & 0xFF
+    buf[offset + 3] = off >> 8
+
+
+def _unpack_duty(buf, offset: int) -> int:
+    """The 16 bit duty cycle of the 4 LEDn_ON/OFF bytes at ``buf[offset]``."""
+    if buf[offset + 1] & 0x10:
+        return 0xFFFF
+    if buf[offset + 3] & 0x10:
+        return 0x0000
+    on = buf[offset] | (buf[offset + 1] << 8)
+    off = buf[offset + 2] | (buf[offset + 3] << 8)
+    return ((off - on) & 0x0FFF) << 4
+
+
+def stagger_phases(duties, mode: str = "even"):
+    """ON times that spread the turn on of channels over the PWM period, so they do not all
+    switch on at the same instant and draw their current at once.
+
+    :param duties: 16 bit duty cycles of the channels, only their number is used for ``"even"``
+    :param str mode: ``"even"`` spaces the ON times equally over the period. ``"balanced"``
+        turns each channel on when the one before it turns off, so the number of channels on
+        at any time stays as low as the duties allow
+    :return: A list of ON times, 0 to 4095, one per channel
+    """
+    count = len(duties)
+    if mode == "even":
+        return [i * 4096 // count for i in range(count)]
+    if mode == "balanced":
+        phases = []
+        phase = 0
+        for value in duties:
+            phases.append(phase)
+            phase = (phase + (value >> 4)) & 0x0FFF
+        return phases
+    raise ValueError(f"Unknown stagger mode {mode}, not 'even' or 'balanced'")
+
+
+def _check_duties(duties) -> None:
+    # The whole frame is checked before any channel is staged, so a bad value cannot leave
+    # half a frame dirty for the next flush()
+    for value in duties:
+        if not 0 <= value <= 0xFFFF:
+            raise ValueError(f"Out of range: value {value} not 0 <= value <= 65,535")
+
+
+def _full(value: int) -> bool:
+    # Full on and full off do not use the ON time
+    return value == 0xFFFF or value < 0x0010
+
 
 class PWMChannel:
     """A single PCA9685 channel that matches the :py:class:`~pwmio.PWMOut` API.
@@ -47,31 +127,17 @@ class PWMChannel:
     def duty_cycle(self) -> int:
         """16 bit value that dictates how much of one cycle is high (1) versus low (0). 0xffff will
         always be high, 0 will always be low and 0x7fff will be half high and then half low.
+        The value is served from the PCA9685 shadow registers, the chip is only read the first
+        time a channel is used.
         """
-        pwm = self._pca.pwm_regs[self._index]
-
-        if pwm[0] == 0x1000:
-            return 0xFFFF
-        if pwm[1] == 0x1000:
-            return 0x0000
-        return pwm[1] << 4
+        return self._pca._get_duty(self._index)
 
     @duty_cycle.setter
     def duty_cycle(self, value: int) -> None:
         if not 0 <= value <= 0xFFFF:
             raise ValueError(f"Out of range: value {value} not 0 <= value <= 65,535")
 
-        if value == 0xFFFF:
-            # Special case for "fully on":
-            self._pca.pwm_regs[self._index] = (0x1000, 0)
-        elif value < 0x0010:
-            # Special case for "fully off":
-            self._pca.pwm_regs[self._index] = (0, 0x1000)
-        else:
-            # Shift our value by four because the PCA9685 is only 12 bits but our value is 16
-            value = value >> 4
-
-            self._pca.pwm_regs[self._index] = (0, value)
+        self._pca._set_duty(self._index, value)
 
 
 class PCAChannels:
@@ -114,6 +180,7 @@ class PCA9685:
         *,
         address: int = 0x40,
         reference_clock_speed: int = 25000000,
+        buffered: bool = False,
     ) -> None:
         self._i2c = i2c
         self._address = address
@@ -122,11 +189,184 @@ class PCA9685:
         """Sequence of 16 `PWMChannel` objects. One for each channel."""
         self.reference_clock_speed = reference_clock_speed
         """The reference clock speed in Hz."""
+        self.buffered = buffered
+        """When True, channel writes only change the shadow registers until `flush` is called."""
+        # Shadow copy of the LEDn_ON/OFF registers, a channel is known once it has been
+        # read or written, and dirty while the chip has not been sent its shadow value
+        self._shadow = bytearray(4 * 16)
+        self._shadow_view = memoryview(self._shadow)
+        self._scratch = bytearray(4)
+        # ON time of each channel, see stagger()
+        self._phase = [0] * 16
+        self._staggered = False
+        self._known = 0
+        self._dirty = 0
+        self._auto_increment = False
         self.reset()
 
     def reset(self) -> None:
         """Reset the chip."""
         self.mode1_reg = 0x00  # Mode1
+        self._auto_increment = False
+
+    def _enable_auto_increment(self) -> None:
+        if not self._auto_increment:
+            self.mode1_reg = self.mode1_reg | _MODE1_AI
+            self._auto_increment = True
+
+    def _get_duty(self, index: int) -> int:
+        offset = 4 * index
+        if not self._known & (1 << index):
+            # without auto-increment all 4 bytes would come from LEDn_ON_L
+            self._enable_auto_increment()
+            self._i2c.readfrom_mem_into(
+                self._address, _LED0_ON_L + offset, self._shadow_view[offset : offset + 4]
+            )
+            self._known |= 1 << index
+        return _unpack_duty(self._shadow, offset)
+
+    def _stage(self, index: int, value: int) -> None:
+        # Update the shadow of one channel, marking it dirty only if the registers change
+        bit = 1 << index
+        offset = 4 * index
+        scratch = self._scratch
+        shadow = self._shadow
+        _pack_duty(scratch, 0, value, self._phase[index])
+        changed = not self._known & bit
+        for i in range(4):
+            if shadow[offset + i] != scratch[i]:
+                shadow[offset + i] = scratch[i]
+                changed = True
+        if changed:
+            self._known |= bit
+            self._dirty |= bit
+
+    def _set_duty(self, index: int, value: int) -> None:
+        self._stage(index, value)
+        if not self.buffered:
+            self.flush()
+
+    def flush(self) -> int:
+        """Send the dirty channels to the chip.
+
+        Dirty channels are grouped into runs of consecutive registers, each written in one
+        auto-increment transaction. A single clean channel between two dirty ones is sent
+        again rather than starting a new transaction.
+
+        :return: The number of I2C transactions used
+        """
+        dirty = self._dirty
+        if not dirty:
+            return 0
+        self._enable_auto_increment()
+        transactions = 0
+        ch = 0
+        while ch < 16:
+            if not dirty & (1 << ch):
+                ch += 1
+                continue
+            start = ch
+            end = ch + 1
+            ch += 1
+            while ch < 16:
+                if dirty & (1 << ch):
+                    end = ch + 1
+                elif ch + 1 < 16 and dirty & (1 << (ch + 1)) and self._known & (1 << ch):
+                    pass
+                else:
+                    break
+                ch += 1
+            self._i2c.writeto_mem(
+                self._address, _LED0_ON_L + 4 * start, self._shadow_view[4 * start : 4 * end]
+            )
+            transactions += 1
+        self._dirty = 0
+        return transactions
+
+    def write_frame(self, duties, start: int = 0) -> None:
+        """Set consecutive channels with as few I2C transactions as possible.
+
+        The LEDn_ON/OFF registers of every channel are packed into the shadow registers and the
+        changed ones are written with register auto-increment, instead of one transaction per
+        channel. When `buffered` is True nothing is sent until `flush` is called.
+
+        :param duties: 16 bit duty cycles, for example an ``array('H')``, one per channel
+        :param int start: The first channel to write
+        """
+        count = len(duties)
+        if start < 0 or start + count > 16:
+            raise ValueError(f"Out of range: channels {start} to {start + count - 1} not 0 to 15")
+        _check_duties(duties)
+        for i in range(count):
+            self._stage(start + i, duties[i])
+        if not self.buffered:
+            self.flush()
+
+    def set_all(self, duties) -> None:
+        """Set every channel in a single I2C transaction.
+
+        :param duties: Either 16 duty cycles, written with :py:meth:`write_frame`, or one
+            16 bit duty cycle written to the ALL_LED registers so every channel gets it.
+            The ALL_LED registers give every channel the same ON time, so once the channels
+            are staggered a duty cycle other than full on or off is written with
+            :py:meth:`write_frame` instead
+        """
+        if isinstance(duties, int):
+            if not 0 <= duties <= 0xFFFF:
+                raise ValueError(f"Out of range: value {duties} not 0 <= value <= 65,535")
+            if self._staggered and not _full(duties):
+                self.write_frame([duties] * 16)
+                return
+            scratch = self._scratch
+            _pack_duty(scratch, 0, duties)
+            self._enable_auto_increment()
+            self._i2c.writeto_mem(self._address, _ALL_LED_ON_L, scratch)
+            self._fill_shadow(scratch)
+        else:
+            self.write_frame(duties)
+
+    def set_phases(self, phases, start: int = 0) -> None:
+        """Set the ON time of consecutive channels. The duty cycle of each channel is kept, its
+        output turns on ``phase`` counts into the PWM period and stays on as long as before.
+        The ON registers are written together with the OFF registers, so this adds no I2C
+        transactions to later channel writes.
+
+        :param phases: ON times, 0 to 4095, one per channel
+        :param int start: The first channel to set
+        """
+        count = len(phases)
+        if start < 0 or start + count > 16:
+            raise ValueError(f"Out of range: channels {start} to {start + count - 1} not 0 to 15")
+        for i in range(count):
+            phase = phases[i]
+            if not 0 <= phase <= 0x0FFF:
+                raise ValueError(f"Out of range: phase {phase} not 0 <= phase <= 4,095")
+            index = start + i
+            self._phase[index] = phase
+            if self._known & (1 << index):
+                self._stage(index, _unpack_duty(self._shadow, 4 * index))
+        self._staggered = any(self._phase)
+        if not self.buffered:
+            self.flush()
+
+    def stagger(self, mode: str = "even", duties=None) -> None:
+        """Give the channels different ON times so they do not all switch on at the start of
+        the PWM period, which spreads the current drawn from the supply over the period.
+
+        :param str mode: ``"even"`` or ``"balanced"``, see :py:func:`stagger_phases`
+        :param duties: The duty cycles to balance for, by default the current ones
+        """
+        if duties is None:
+            # only "balanced" needs the duty cycles, "even" is not worth reading the chip for
+            duties = [self._get_duty(i) for i in range(16)] if mode == "balanced" else [0] * 16
+        self.set_phases(stagger_phases(duties, mode))
+
+    def _fill_shadow(self, regs) -> None:
+        # Every channel was sent the same 4 LEDn_ON/OFF bytes through the ALL_LED registers
+        for offset in range(0, 4 * 16, 4):
+            self._shadow[offset : offset + 4] = regs
+        self._known = 0xFFFF
+        self._dirty = 0
 
     @property
     def frequency(self) -> float:
@@ -150,6 +390,7 @@ class PCA9685:
         time.sleep(0.005)
         # Mode 1, autoincrement on, fix to stop pca9685 from accepting commands at all addresses
         self.mode1_reg = old_mode | 0xA0
+        self._auto_increment = True
 
     def __enter__(self):
         return self
@@ -165,3 +406,154 @@ class PCA9685:
     def deinit(self) -> None:
         """Stop using the pca9685."""
         self.reset()
+
+
+class BusChannels:
+    """The channels of every chip on a :py:class:`PCA9685Bus` as one sequence. Channel ``n`` is
+    channel ``n % 16`` of chip ``n // 16``.
+
+    :param PCA9685Bus bus: The PCA9685Bus object
+    """
+
+    def __init__(self, bus):
+        self._bus = bus
+
+    def __len__(self) -> int:
+        return 16 * len(self._bus.chips)
+
+    def __getitem__(self, index: int) -> PWMChannel:
+        return self._bus.chips[index >> 4].channels[index & 0x0F]
+
+
+class PCA9685Bus:
+    """
+    Several PCA9685s on one I2C bus used as a single device with 16 channels per chip.
+
+    Channel writes are buffered on every chip and sent by :py:meth:`flush`, one auto-increment
+    transaction per run of changed channels, so a frame that changes all channels of N chips
+    costs N transactions. The chips also answer the ALL_CALL address, which updates all of them
+    in one transaction for :py:meth:`set_all`, :py:meth:`blackout` and :py:attr:`frequency`.
+
+    :param i2c: The I2C bus the chips are on
+    :param addresses: The address of each chip, chip 0 first
+    :param int all_call_address: The ALL_CALL address of the chips, 0x70 after power up
+    :param int reference_clock_speed: The reference clock speed of every chip in Hz
+    """
+
+    def __init__(
+        self,
+        i2c,
+        addresses=(0x40,),
+        *,
+        all_call_address: int = 0x70,
+        reference_clock_speed: int = 25000000,
+    ) -> None:
+        self._i2c = i2c
+        self._all_call_address = all_call_address
+        self._regs = bytearray(4)
+        self._byte = bytearray(1)
+        self.chips = [
+            PCA9685(i2c, address=address, reference_clock_speed=reference_clock_speed, buffered=True)
+            for address in addresses
+        ]
+        """The `PCA9685` objects, in channel order."""
+        self.channels = BusChannels(self)
+        """Sequence of 16 `PWMChannel` objects per chip."""
+        for chip in self.chips:
+            # reset() clears MODE1, answer the ALL_CALL address again
+            chip.mode1_reg = _MODE1_AI | _MODE1_ALLCALL
+            chip._auto_increment = True
+
+    def _broadcast(self, register: int, value: int) -> None:
+        self._byte[0] = value
+        self._i2c.writeto_mem(self._all_call_address, register, self._byte)
+
+    def flush(self) -> int:
+        """Send the changed channels of every chip.
+
+        :return: The number of I2C transactions used
+        """
+        transactions = 0
+        for chip in self.chips:
+            transactions += chip.flush()
+        return transactions
+
+    def write_frame(self, duties, start: int = 0) -> int:
+        """Set consecutive channels, across chips, and send them.
+
+        :param duties: 16 bit duty cycles, for example an ``array('H')``, one per channel
+        :param int start: The first channel to write
+        :return: The number of I2C transactions used
+        """
+        count = len(duties)
+        if start < 0 or start + count > 16 * len(self.chips):
+            raise ValueError(
+                f"Out of range: channels {start} to {start + count - 1} not 0 to {16 * len(self.chips) - 1}"
+            )
+        _check_duties(duties)
+        chips = self.chips
+        for i in range(count):
+            index = start + i
+            chips[index >> 4]._stage(index & 0x0F, duties[i])
+        return self.flush()
+
+    def set_all(self, value: int) -> None:
+        """Set every channel of every chip in a single I2C transaction to the ALL_CALL address.
+        Once the channels are staggered, a duty cycle other than full on or off is written with
+        :py:meth:`write_frame` instead, keeping each channel's ON time.
+
+        :param int value: 16 bit duty cycle
+        """
+        if not 0 <= value <= 0xFFFF:
+            raise ValueError(f"Out of range: value {value} not 0 <= value <= 65,535")
+        if not _full(value) and any(chip._staggered for chip in self.chips):
+            self.write_frame([value] * len(self.channels))
+            return
+        regs = self._regs
+        _pack_duty(regs, 0, value)
+        self._i2c.writeto_mem(self._all_call_address, _ALL_LED_ON_L, regs)
+        for chip in self.chips:
+            chip._fill_shadow(regs)
+
+    def stagger(self, mode: str = "even", duties=None) -> None:
+        """Spread the ON times of all channels of all chips over the PWM period, see
+        :py:func:`stagger_phases`.
+
+        :param str mode: ``"even"`` or ``"balanced"``
+        :param duties: The duty cycles to balance for, by default the current ones
+        """
+        if duties is None:
+            if mode == "balanced":
+                duties = [chip._get_duty(i) for chip in self.chips for i in range(16)]
+            else:
+                duties = [0] * len(self.channels)
+        phases = stagger_phases(duties, mode)
+        for k, chip in enumerate(self.chips):
+            chip.set_phases(phases[16 * k : 16 * k + 16])
+        self.flush()
+
+    def blackout(self) -> None:
+        """Turn every channel of every chip off."""
+        self.set_all(0)
+
+    @property
+    def frequency(self) -> float:
+        """The PWM frequency in Hertz of all chips, set with one broadcast."""
+        return self.chips[0].frequency
+
+    @frequency.setter
+    def frequency(self, freq: float) -> None:
+        prescale = int(self.chips[0].reference_clock_speed / 4096.0 / freq + 0.5)
+        if prescale < 3:
+            raise ValueError("PCA9685 cannot output at the given frequency")
+        mode = _MODE1_AI | _MODE1_ALLCALL
+        self._broadcast(_MODE1_REG, mode | _MODE1_SLEEP)
+        self._broadcast(_PRESCALE_REG, prescale)
+        self._broadcast(_MODE1_REG, mode)
+        time.sleep(0.005)
+        self._broadcast(_MODE1_REG, mode | _MODE1_RESTART)
+
+    def deinit(self) -> None:
+        """Stop using the chips."""
+        for chip in self.chips:
+            chip.deinit()
@@ -0,0 +1,87 @@
+import array, time
+from machine import Pin, I2C
+from micropython_pca9685.pca9685 import PCA9685Bus, I2C_PROFILES
+from test_pca9685_4PCA import BOARD_TYPE, SDA_PIN, SCL_PIN, PCA_SWITCH_PIN, PCA_ADDRESSES
+
+# I2C latency of the PCA9685 modules for each bus clock, on the board set by BOARD_TYPE
+# in test_pca9685_4PCA.py. For every profile it times:
+#   single  one channel written in its own transaction
+#   frame1  every channel of every module, one transaction per channel
+#   bulk    every channel of every module with write_frame, one transaction per module
+#   all     every channel set with one ALL_CALL broadcast
+# After the bulk frames the registers are read back and compared, a profile with I2C
+# errors or wrong read backs is not reliable on this board's wiring
+# Use the fastest reliable profile as I2C_PROFILE for the board
+# Needs pca9685.py of this folder on the board as micropython_pca9685/pca9685.py
+
+FRAMES = 50
+
+def time_us(fn, count):
+    start = time.ticks_us()
+    for i in range(count):
+        fn(i)
+    return time.ticks_diff(time.ticks_us(), start) / count
+
+def verify(bus, i2c):
+    regs = bytearray(4 * 16)
+    for chip in bus.chips:
+        i2c.readfrom_mem_into(chip._address, 0x06, regs)
+        if regs != chip._shadow:
+            return False
+    return True
+
+def run(profile):
+    i2c = I2C(1, sda=Pin(SDA_PIN), scl=Pin(SCL_PIN), freq=I2C_PROFILES[profile])
+    bus = PCA9685Bus(i2c, PCA_ADDRESSES)
+    channels = len(bus.channels)
+    # two frames, alternated so every channel changes every time
+    frames = [array.array("H", [(0x1000 + 0x100 * ch + 0x80 * k) & 0xFFF0 for ch in range(channels)]) for k in range(2)]
+    chip = bus.chips[0]
+
+    def single(i):
+        chip.channels[0].duty_cycle = frames[i & 1][0]
+        chip.flush()
+
+    def frame1(i):
+        frame = frames[i & 1]
+        for ch in range(channels):
+            bus.channels[ch].duty_cycle = frame[ch]
+            bus.chips[ch >> 4].flush()
+
+    def bulk(i):
+        bus.write_frame(frames[i & 1])
+
+    def all_call(i):
+        bus.set_all(frames[i & 1][0])
+
+    try:
+        results = (time_us(single, FRAMES * 4), time_us(frame1, FRAMES), time_us(bulk, FRAMES))
+        ok = verify(bus, i2c)
+        results += (time_us(all_call, FRAMES),)
+    except OSError:
+        results = None
+        ok = False
+    if ok:
+        bus.blackout()
+    if results:
+        print("{0:10s} single {1:7.1f}us  frame1 {2:8.1f}us  bulk {3:7.1f}us  all {4:6.1f}us  {5}".format(
+            profile, results[0], results[1], results[2], results[3], "OK" if ok else "FAIL"))
+    else:
+        print("{0:10s} I2C error  FAIL".format(profile))
+    return results[2] if ok else None
+
+def main():
+    pcaswitch = Pin(PCA_SWITCH_PIN, Pin.OUT)
+    pcaswitch.off()  # PNP, turn on the PCA9685 modules
+    time.sleep(1)  # Wait for the PCA9685 modules to initialize
+    print("{0}: {1} modules".format(BOARD_TYPE, len(PCA_ADDRESSES)))
+    best = None
+    best_us = None
+    for profile in ("standard", "fast", "fast_plus"):
+        us = run(profile)
+        if us is not None and (best_us is None or us < best_us):
+            best, best_us = profile, us
+    print("fastest reliable profile: {0}".format(best))
+
+if __name__ == "__main__":
+    main()
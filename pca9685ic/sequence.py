@@ -0,0 +1,154 @@
+import json
+import struct
+
+# Compiled light show sequences
+# A sequences/*.json file is a list of {"m": module letter, "ch": channel, "lu": brightness %,
+# "s": fade time s, "w": wait s} entries. Compiled, it is a 4 byte header then one fixed
+# width little endian record per entry:
+#   module index (u8, 'a' = 0), channel (u8), brightness in 1/100 % (u16),
+#   fade time in ms (u16), wait in ms (u16)
+# so brightness is at most 655.35 %, fade and wait times at most 65.535 s
+# The device streams records with readinto into one reusable buffer, so a sequence of
+# any length loads instantly and uses the same small amount of RAM
+#
+# Compile on the host, then copy the .bin files to sequences/ on the board, with or without
+# the .json files (a .bin is played in place of the .json with the same name):
+#   python sequence.py sequences/*.json
+# Uncompiled .json files are read incrementally by JsonSequenceReader, one entry at a time,
+# so the first LED lights without waiting for the whole file to parse
+
+MAGIC = b"PCS1"
+RECORD = "<BBHHH"
+RECORD_SIZE = struct.calcsize(RECORD)
+CHUNK_RECORDS = 32
+CHUNK_SIZE = 128
+MAX_ENTRY = 128  # bytes of one entry without the whitespace outside strings
+
+QUOTE = 0x22
+BACKSLASH = 0x5C
+LBRACE = 0x7B
+RBRACE = 0x7D
+SPACE = 0x20
+TAB = 0x09
+CR = 0x0D
+LF = 0x0A
+
+# times are whole milliseconds, so a show scheduled from them adds no rounding errors
+def entry_record(entry):
+    return (ord(entry['m']) - ord('a'), entry['ch'], entry['lu'], round(entry['s'] * 1000), round(entry['w'] * 1000))
+
+def pack_entry(entry):
+    values = (ord(entry['m']) - ord('a'), entry['ch'], round(entry['lu'] * 100),
+              round(entry['s'] * 1000), round(entry['w'] * 1000))
+    for value, limit, name in zip(values, (0xFF, 0xFF, 0xFFFF, 0xFFFF, 0xFFFF),
+                                  ("m", "ch", "lu", "s", "w")):
+        if not 0 <= value <= limit:
+            raise ValueError("'{0}' out of range in sequence entry {1}".format(name, entry))
+    return struct.pack(RECORD, *values)
+
+def compile_file(src, dst):
+    with open(src, "r") as f:
+        entries = json.load(f)
+    # every entry is checked before anything is written, a bad one leaves no partial .bin
+    records = []
+    for i, entry in enumerate(entries):
+        try:
+            records.append(pack_entry(entry))
+        except ValueError as e:
+            raise ValueError("{0}: entry {1}: {2}".format(src, i, e))
+    with open(dst, "wb") as f:
+        f.write(MAGIC)
+        for record in records:
+            f.write(record)
+    return len(entries)
+
+# yields (module, ch, brightness %, fade time ms, wait ms) from a compiled sequence
+class SequenceReader:
+    def __init__(self, path, chunk_records=CHUNK_RECORDS):
+        self.path = path
+        self.buf = bytearray(chunk_records * RECORD_SIZE)
+        self.view = memoryview(self.buf)
+
+    def __iter__(self):
+        buf = self.buf
+        with open(self.path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError("not a compiled sequence: " + self.path)
+            while True:
+                n = f.readinto(self.view)
+                if not n:
+                    break
+                for o in range(0, n - RECORD_SIZE + 1, RECORD_SIZE):
+                    yield (buf[o], buf[o + 1], (buf[o + 2] | (buf[o + 3] << 8)) / 100,
+                           buf[o + 4] | (buf[o + 5] << 8), buf[o + 6] | (buf[o + 7] << 8))
+
+# yields (module, ch, brightness %, fade time ms, wait ms) from a JSON sequence
+# The file is read in small chunks, the bytes of one {...} entry are collected and only
+# that entry is parsed, so memory use does not grow with the length of the sequence
+# Whitespace outside strings is not collected, so indented (pretty printed) files fit as well
+class JsonSequenceReader:
+    def __init__(self, path, chunk_size=CHUNK_SIZE, max_entry=MAX_ENTRY):
+        self.path = path
+        self.buf = bytearray(chunk_size)
+        self.view = memoryview(self.buf)
+        self.entry = bytearray(max_entry)
+
+    def __iter__(self):
+        buf = self.buf
+        entry = self.entry
+        size = len(entry)
+        n = 0
+        depth = 0
+        in_str = False
+        escape = False
+        with open(self.path, "rb") as f:
+            while True:
+                got = f.readinto(self.view)
+                if not got:
+                    break
+                for i in range(got):
+                    c = buf[i]
+                    if depth == 0:
+                        # between entries, skip [ , ] and whitespace
+                        if c == LBRACE:
+                            entry[0] = c
+                            n = 1
+                            depth = 1
+                        continue
+                    if not in_str and (c == SPACE or c == LF or c == CR or c == TAB):
+                        continue
+                    if n == size:
+                        raise ValueError("sequence entry too long in " + self.path)
+                    entry[n] = c
+                    n += 1
+                    if in_str:
+                        if escape:
+                            escape = False
+                        elif c == BACKSLASH:
+                            escape = True
+                        elif c == QUOTE:
+                            in_str = False
+                    elif c == QUOTE:
+                        in_str = True
+                    elif c == LBRACE:
+                        depth += 1
+                    elif c == RBRACE:
+                        depth -= 1
+                        if depth == 0:
+                            yield entry_record(json.loads(bytes(entry[:n])))
+        if depth:
+            raise ValueError("unterminated sequence entry in " + self.path)
+
+def main():
+    import sys
+    for src in sys.argv[1:]:
+        dst = src.rsplit(".", 1)[0] + ".bin"
+        try:
+            count = compile_file(src, dst)
+        except ValueError as e:
+            print(e)
+            sys.exit(1)
+        print("{0}: {1} entries, {2} bytes".format(dst, count, len(MAGIC) + count * RECORD_SIZE))
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,23 @@
 import asyncio
 #from platform import machine
 from machine import Pin, I2C
-from micropython_pca9685 import PCA9685
-import ujson
-import uio
+# PCA9685Bus and I2C_PROFILES are in pca9685.py of this folder, copy it to the board as
+# micropython_pca9685/pca9685.py (replacing the stock driver) so these imports find it
+from micropython_pca9685.pca9685 import PCA9685Bus, I2C_PROFILES
+from fadeengine import FadeEngine
+from sequence import SequenceReader, JsonSequenceReader
+from timeline import Timeline
 import os
 import neopixel
 import random
 import utime
 
 PWM_FREQUENCY = 1024  # PWM frequency for PCA9685
+PCA_ADDRESSES = (0x40, 0x41, 0x42, 0x43)  # PCA9685 modules a-d
 
 BOARD_TYPE = "XIAO_RP2040"  # Options: "RP2040_ZERO", "XIAO_RP2040", "ESP32C3", "S2_MINI"
+# I2C_PROFILE per board is one of "standard" (100kHz), "fast" (400kHz), "fast_plus" (1MHz)
+# run pca9685_benchmark.py on the board to find the fastest one that works with its wiring
 
 # Set I2C pins based on board type
 if BOARD_TYPE == "XIAO_RP2040":
@@ -21,10 +27,10 @@ if BOARD_TYPE == "XIAO_RP2040":
     XIAO_LED_PIN = 12  # RGB LED pin for Xiao RP2040
     from ws2812 import WS2812
     PCA_SWITCH_PIN = 28  # Pin to control the PCA9685 modules
-    SLEEPLEN_MOD = 1.0
-    WAIT_TIME_MOD = 1.0
+    I2C_PROFILE = "fast"
 elif BOARD_TYPE == "ESP32C3":
     PCA_SWITCH_PIN = 0  # Pin to control the PCA9685 modules
+    I2C_PROFILE = "fast"
     SDA_PIN = 6  # SDA pin for I2C on Xiao RP2040
     SCL_PIN = 7  # SCL pin for I2C on Xiao RP2040
     LED_PIN = 10  # Pin connected to the internal LED
@@ -33,16 +39,14 @@ elif BOARD_TYPE == "S2_MINI":
     SCL_PIN = 5  # SCL pin for I2C on S2 Mini
     LED_PIN = 15  # Pin connected to the internal LED
     PCA_SWITCH_PIN = 1  # Pin to control the PCA9685 modules
-    SLEEPLEN_MOD = 2.0
-    WAIT_TIME_MOD = 1.9
+    I2C_PROFILE = "fast"
 else:  # Default to RP2040_ZERO
     SDA_PIN = 2  # SDA pin for I2C on RP2040 Zero
     SCL_PIN = 3  # SCL pin for I2C on RP2040 Zero
     NEOPIXEL_PIN = 16  # Pin connected to the NeoPixel LED
     from ws2812 import WS2812
     PCA_SWITCH_PIN = 28  # Pin to control the PCA9685 modules
-    SLEEPLEN_MOD = 1.0
-    WAIT_TIME_MOD = 1.0
+    I2C_PROFILE = "fast"
 
 SHORT = 0.125
 LONG = 0.5
@@ -55,35 +59,92 @@ LED_OFF = (0, 0, 0)  # Color to turn off the NeoPixel LED
 
 STATIC_CHOICES = [("a", 2), ("c", 14), ("c", 2), ("d", 2), ("b", 2), ("b", 13)]
 
-async def blink_LED(duration, color=RED):
-    if BOARD_TYPE == "XIAO_RP2040":
-        power = Pin(XIAO_POWER_PIN, Pin.OUT)
-        led = WS2812(XIAO_LED_PIN,1)
-        power.value(1)
-        led.pixels_fill(color)  # Set the color of the NeoPixel
-        led.pixels_show()
-        await asyncio.sleep(duration)
-        power.value(0)
-    elif BOARD_TYPE == "S2_MINI": # ignore color as S2_MINI uses a different LED
-        led = Pin(LED_PIN, Pin.OUT)
-        led.value(1)  # Turn on the LED
-        await asyncio.sleep(duration)
-        led.value(0)  # Turn off the LED
-    else:
-        led = neopixel.NeoPixel(Pin(NEOPIXEL_PIN), 1)
-        led[0] = color  # Set the color of the NeoPixel
-        led.write()
-        await asyncio.sleep(duration)
-        led[0] = LED_OFF  # Set the color of the NeoPixel
-        led.write()  # Turn off the LED
-
-async def run_sequence(pca, file_name):
+STATUS_QUEUE_LEN = 8  # pending blink patterns, extra requests are dropped
+
+# Owns the status LED for the life of the program and plays blink patterns from a queue
+# request() only queues the pattern and returns, a single task does the blinking
+class StatusLED:
+    def __init__(self):
+        if BOARD_TYPE == "XIAO_RP2040":
+            self.power = Pin(XIAO_POWER_PIN, Pin.OUT)
+            self.power.value(0)
+            self.led = WS2812.get(XIAO_LED_PIN, 1)
+        elif BOARD_TYPE == "S2_MINI": # ignore color as S2_MINI uses a different LED
+            self.led = Pin(LED_PIN, Pin.OUT)
+        else:
+            self.led = neopixel.NeoPixel(Pin(NEOPIXEL_PIN), 1)
+        self._queue = []
+        self._event = asyncio.Event()
+        self._task = None
+
+    def _on(self, color):
+        if BOARD_TYPE == "XIAO_RP2040":
+            self.power.value(1)
+            self.led.pixels_fill(color)  # Set the color of the NeoPixel
+            self.led.pixels_show()
+        elif BOARD_TYPE == "S2_MINI":
+            self.led.value(1)  # Turn on the LED
+        else:
+            self.led[0] = color  # Set the color of the NeoPixel
+            self.led.write()
+
+    def _off(self):
+        if BOARD_TYPE == "XIAO_RP2040":
+            self.power.value(0)
+        elif BOARD_TYPE == "S2_MINI":
+            self.led.value(0)  # Turn off the LED
+        else:
+            self.led[0] = LED_OFF  # Set the color of the NeoPixel
+            self.led.write()  # Turn off the LED
+
+    def request(self, duration, color=RED, repeat=1):
+        if len(self._queue) < STATUS_QUEUE_LEN:
+            self._queue.append((duration, color, repeat))
+            self._event.set()
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            await self._event.wait()
+            self._event.clear()
+            while self._queue:
+                duration, color, repeat = self._queue.pop(0)
+                for r in range(repeat):
+                    self._on(color)
+                    await asyncio.sleep(duration)
+                    self._off()
+                    await asyncio.sleep(BLINK_SLEEP)
+
+_status_led = None
+
+def status_led():
+    global _status_led
+    if _status_led is None:
+        _status_led = StatusLED()
+    return _status_led
+
+def blink_LED(duration, color=RED, repeat=1):
+    # queue the blink and return at once
+    status_led().request(duration, color, repeat)
+
+# Use the compiled sequences/<name>.bin when there is one, see sequence.py
+def sequence_path(file_name):
+    compiled = file_name.rsplit(".", 1)[0] + ".bin"
     try:
-        with uio.open("sequences/" + file_name, "r") as f:
-            json_data = ujson.load(f)
-            
-        end = len(json_data)
-        #print(f"Running sequence from file: {file_name}, total entries: {end}")
+        os.stat("sequences/" + compiled)
+        return compiled
+    except OSError:
+        return file_name
+
+async def run_sequence(fades, file_name, timeline=None):
+    try:
+        path = sequence_path(file_name)
+        if path.endswith(".bin"):
+            records = SequenceReader("sequences/" + path)  # Streamed from flash a chunk at a time
+        else:
+            records = JsonSequenceReader("sequences/" + path)  # Parsed one entry at a time
+        #print(f"Running sequence from file: {path}")
 
         # Keep track of the last channel and module
         last_ch = None
@@ -94,81 +155,64 @@ async def run_sequence(pca, file_name):
             is_static = True
         
         static_substitutions = random.choice(STATIC_CHOICES)
+        static_module = ord(static_substitutions[0]) - ord('a')
 
-        for i in range(end):
-            
-            #print(f"json_data[{i}]={json_data[i]}")
+        # Events run on absolute deadlines from the start of the sequence, so the show keeps time on every board
+        if timeline is None:
+            timeline = Timeline()
+        timeline.reset()
 
+        for module, ch, brightness, sleeplen_ms, wait_ms in records:
+            
             if is_static:
                 #print(f"static_substitutions={static_substitutions}")
-                m = static_substitutions[0]
+                module = static_module
                 ch = static_substitutions[1]
-            else:
-                m = json_data[i]['m']
-                ch = json_data[i]['ch']
 
-            #print(f"is_static={is_static}, ch={ch}, m={m}")
-            module = ord(m) - ord('a')
+            #print(f"is_static={is_static}, ch={ch}, module={module}")
             
             # Safety check: ensure module index is valid (0-3 for pca modules a-d)
-            if module < 0 or module >= len(pca):
-                #print(f"Invalid module '{m}' (index {module}), skipping")
+            if module < 0 or module >= len(fades):
+                #print(f"Invalid module index {module}, skipping")
                 continue
-                
-            brightness = json_data[i]['lu']
-            sleeplen = json_data[i]['s']
             
-            # Skip creating a fade task (tail) if this is the same channel and module as the last one
+            # Skip starting a fade (tail) if this is the same channel and module as the last one
             if last_ch != ch or last_module != module:
-                #print(f"fade module={module} ch={ch}, brightness={brightness}, sleep={sleeplen}")
-                asyncio.create_task(fade(pca[module], ch, brightness, sleeplen)) # Create a task for each LED
+                #print(f"fade module={module} ch={ch}, brightness={brightness}, sleep={sleeplen_ms}")
+                fades.fade(module, ch, brightness, sleeplen_ms / 1000) # One fade engine task animates every LED
             else:
-                #print(f"fade module={module} ch={ch}, brightness={brightness}, sleep={sleeplen}")
-                pca[module].channels[ch].duty_cycle = percentage_to_duty_cycle(brightness)
-                #pca.channels[ch].duty_cycle = percentage_to_duty_cycle(brightness)
-                await asyncio.sleep(sleeplen * SLEEPLEN_MOD)
+                #print(f"fade module={module} ch={ch}, brightness={brightness}, sleep={sleeplen_ms}")
+                fades.set(module, ch, brightness)
+                await timeline.wait(sleeplen_ms)  # Whole milliseconds, no float rounding
                 
             # Update the last channel and module
             last_ch = ch
             last_module = module
 
-            await asyncio.sleep(json_data[i]['w'] * WAIT_TIME_MOD)
+            await timeline.wait(wait_ms)
         return True
     except OSError as e:
         #print(f"Error opening file {file_name}: {e}")
-        await blink_LED(LONG, RED)  # Changed to use proper function name and single duration
+        blink_LED(LONG, RED)  # Changed to use proper function name and single duration
         return False
-    except ujson.JSONDecodeError:
-        await blink_LED(SHORT, RED)  # Changed to use proper function name and single duration
+    except ValueError:  # Malformed JSON or compiled sequence
+        blink_LED(SHORT, RED)  # Changed to use proper function name and single duration
         #print(f"Error parsing JSON in file {file_name}")
         return False
     except Exception as e:
-        await blink_LED(LONG, RED)  # Changed to use proper function name and single duration
+        blink_LED(LONG, RED)  # Changed to use proper function name and single duration
         #print(f"Unexpected error: {e}")
         return False
 
-def percentage_to_duty_cycle(percentage):
-    return int((percentage / 100) * 0xFFFF)
-
-async def fade(pca, ch, brightness, sleeplen=0.25, fadevalue=0.01):
-    iterations = max(1, int(sleeplen/fadevalue))  # Renamed from 'iter' and added safety check
-    dimval = brightness/iterations
-    for i in range(iterations):
-        pca.channels[ch].duty_cycle = percentage_to_duty_cycle((i+1)*dimval)
-        await asyncio.sleep(fadevalue)
-    #print(f"LED {ch} brightness at {(int)((i+1)*dimval)}%")
-    for i in range(iterations):
-        pca.channels[ch].duty_cycle = percentage_to_duty_cycle(brightness - ((i+1)*dimval))
-        await asyncio.sleep(fadevalue)
-    #print(f"LED {ch} brightness at {brightness - (int)((i+1)*dimval)}%")
-    pca.channels[ch].duty_cycle = percentage_to_duty_cycle(0)
-
-async def run_static_sequences_continuously(pca, stop_event):
+async def run_static_sequences_continuously(fades, stop_event):
     static_files = ["static_longthrob_sequence.json", "static_shortthrob_sequence.json"]
     while not stop_event.is_set():
         for file_name in static_files:
-            await run_sequence(pca, file_name)
-            await asyncio.sleep(0)  # Yield to event loop
+            if await run_sequence(fades, file_name):
+                await asyncio.sleep(0)  # Yield to event loop
+            else:
+                # blink_LED() no longer waits, back off so a bad file is not retried in a tight loop
+                await asyncio.sleep(LONG + BLINK_SLEEP)
 
 # Define the main function to run the event loop
 async def main():
@@ -189,29 +233,28 @@ async def main():
     pcaswitch.off()  # PNP, turn on the PCA9685 modules
     await asyncio.sleep(1)  # Wait for the PCA9685 modules to initialize
 
-    i2c = I2C(1, sda=Pin(SDA_PIN), scl=Pin(SCL_PIN))  # Correct I2C pins for RP2040
-    pca_A = PCA9685(i2c, address=0x40)
-    pca_B = PCA9685(i2c, address=0x41)
-    pca_C = PCA9685(i2c, address=0x42)
-    pca_D = PCA9685(i2c, address=0x43)
-
-    pca_A.frequency = pca_B.frequency = pca_C.frequency = pca_D.frequency = PWM_FREQUENCY
-    pca = [pca_A, pca_B, pca_C, pca_D] 
+    i2c = I2C(1, sda=Pin(SDA_PIN), scl=Pin(SCL_PIN), freq=I2C_PROFILES[I2C_PROFILE])  # Correct I2C pins for RP2040
+    bus = PCA9685Bus(i2c, PCA_ADDRESSES)  # Modules a-d as one 64 channel device
+    bus.frequency = PWM_FREQUENCY  # One ALL_CALL broadcast sets every module
+    bus.stagger()  # Spread the LED turn-on times over the PWM period to limit inrush on the PCA_SWITCH_PIN supply
+    pca = bus.chips
     module = ['a', 'b', 'c', 'd']
+    fades = FadeEngine(pca)  # Buffers the PCA9685s and flushes each one once per tick
+    fades.start()
     
     # Test code - Set to True to enable testing
     if False: # Set to True to Test all LEDs on all modules
         for i in range(len(pca)):
             for j in range(16):
                 print(f"mod:{module[i]},{j}")
-                asyncio.create_task(fade(pca[i], j, brightness, walk[0])) # Create a task for each LED
+                fades.fade(i, j, brightness, walk[0])
                 await asyncio.sleep(walk[1])
 
     if False: # Set to True to SLOWLY Test all LEDs on all modules
         for i in range(len(pca)):
             for j in range(16):
                 print(f"mod:{module[i]},{j}")
-                asyncio.create_task(fade(pca[i], j, brightness, slow[0])) # Create a task for each LED
+                fades.fade(i, j, brightness, slow[0])
                 await asyncio.sleep(0.5)
     
     # Main sequence loop
@@ -221,21 +264,31 @@ async def main():
         files = os.listdir(dir)
         # files = ["A_LED_sequence.json"]
         # Remove static files from the list to avoid double-running
-        static_files = {"static_longthrob_sequence.json", "static_shortthrob_sequence.json"}
-        sequence_files = [f for f in files if f not in static_files]
+        static_stems = {"static_longthrob_sequence", "static_shortthrob_sequence"}
+        # One entry per sequence, .json or .bin, run_sequence plays the .bin when there is one
+        sequence_files = []
+        seen = set()
+        for f in files:
+            stem, _, ext = f.rpartition(".")
+            if ext in ("json", "bin") and stem not in static_stems and stem not in seen:
+                seen.add(stem)
+                sequence_files.append(f)
 
         stop_event = asyncio.Event()
-        static_task = asyncio.create_task(run_static_sequences_continuously(pca, stop_event))
+        static_task = asyncio.create_task(run_static_sequences_continuously(fades, stop_event))
+        timeline = Timeline()
 
         try:
             for f in sequence_files:
-                await blink_LED(LONG, GREEN)  # Flash the LED green to indicate start
+                blink_LED(LONG, GREEN)  # Flash the LED green to indicate start
                 print(f"Running sequence from file: {f}")
-                await run_sequence(pca, f) # Run the sequence from the JSON file
+                await run_sequence(fades, f, timeline) # Run the sequence from the JSON file
+                print(f"Timing: {timeline.report()}")
                 await asyncio.sleep(1)
         finally:
             stop_event.set()
             await static_task  # Wait for static task to finish
+            bus.blackout()  # Every LED on every module off in one broadcast
 
     pcaswitch.off()
 
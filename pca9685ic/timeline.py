@@ -0,0 +1,46 @@
+import asyncio
+import time
+
+# Absolute deadline timing for light show sequences
+# Every event time is the previous deadline plus its delay, not "now" plus the delay, so
+# I2C writes, scheduling and slow boards make single events late but never shift the
+# rest of the show. A late event does not move the timeline, the next waits are shorter
+# until it is back on time.
+# Lateness (how long after its deadline an event ran) is collected for report()
+
+class Timeline:
+    def __init__(self):
+        self.reset()
+
+    # start the timeline now
+    def reset(self):
+        self.start = time.ticks_ms()
+        self.deadline = self.start
+        self.events = 0
+        self.late = 0
+        self.total_late_ms = 0
+        self.max_late_ms = 0
+
+    # sleep until ms after the previous deadline
+    async def wait(self, ms):
+        self.deadline = time.ticks_add(self.deadline, ms)
+        delay = time.ticks_diff(self.deadline, time.ticks_ms())
+        if delay > 0:
+            await asyncio.sleep_ms(delay)
+        else:
+            await asyncio.sleep_ms(0)
+        late = time.ticks_diff(time.ticks_ms(), self.deadline)
+        self.events += 1
+        if late > 0:
+            self.late += 1
+            self.total_late_ms += late
+            if late > self.max_late_ms:
+                self.max_late_ms = late
+
+    def elapsed_ms(self):
+        return time.ticks_diff(time.ticks_ms(), self.start)
+
+    def report(self):
+        mean = self.total_late_ms / self.events if self.events else 0
+        return "{0} events in {1}ms, {2} late, mean {3:.1f}ms, max {4}ms".format(
+            self.events, self.elapsed_ms(), self.late, mean, self.max_late_ms)
@@ -16,17 +16,14 @@ import time
 
 def testLEDBar(shiftreg, pausetime):
     shiftreg.set_register()
-    for i in range(len(shiftreg.register)):
-        shiftreg.register[i] = 1
+    for i in range(1, shiftreg.size + 1):
+        shiftreg.set_bar(i)
         shiftreg.set_register()
         time.sleep(pausetime)
-    while i >= 0:
-        shiftreg.register[i] = 0
+    for i in range(shiftreg.size - 1, -1, -1):
+        shiftreg.set_bar(i)
         shiftreg.set_register()
         time.sleep(pausetime)
-        i -= 1
-    shiftreg.register = [0,0,0,0,0,0,0,0,0,0]
-    shiftreg.set_register()
     
 def main():
     try:
@@ -14,13 +14,54 @@ dataPin = 8 #SER
 #   clockPin = 6 (SRCLK pin 11 on 74HC595)
 #   dataPin = 8 (SER pin 14 on 74HC595)
 # First, set the register size
-# Next, set the register property in the class as an array, for example if the size is 8, then the register is [0,0,0,0,0,0,0,0]
-# Then call the set_register() method to set the register
-# To change the register, change the register property then call the set_register() method again
+# The register state is packed into a single integer, bit 0 is Q0 of the first shift register,
+# bit 8 is Q0 of the second (daisy chained) shift register, and so on
+# Change the state with set_bit(), set_bits(mask) or set_bar(n), then call set_register()
+# write_if_changed() only clocks the chain when the state differs from the last latched value
+# writes and skipped count how many shift/latch sequences were issued and avoided
+# The register property still accepts a list, for example [0,0,0,0,0,0,0,0], and returns a
+# list-like view that writes through, so r.register[i] = 1 sets bit i of the state
+
+# list view of a shiftregister's bits, reads and writes go to shiftreg.bits
+class registerview():
+    def __init__(self, shiftreg):
+        self.shiftreg = shiftreg
+
+    def __len__(self):
+        return self.shiftreg.size
+
+    def _index(self, i):
+        size = self.shiftreg.size
+        if i < 0:
+            i += size
+        if not 0 <= i < size:
+            raise IndexError("register index out of range")
+        return i
+
+    def __getitem__(self, i):
+        return (self.shiftreg.bits >> self._index(i)) & 1
+
+    def __setitem__(self, i, value):
+        self.shiftreg.set_bit(self._index(i), value)
+
+    def __iter__(self):
+        bits = self.shiftreg.bits
+        for i in range(self.shiftreg.size):
+            yield (bits >> i) & 1
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return repr(list(self))
 
 class shiftregister():
     def __init__(self) -> None:
-        self.register = []
+        self.size = 0
+        self.bits = 0
+        self._latched = None
+        self.writes = 0
+        self.skipped = 0
         self.latch = Pin(latchPin, Pin.OUT)
         self.clock = Pin(clockPin, Pin.OUT)
         self.data = Pin(dataPin, Pin.OUT)
@@ -43,27 +84,77 @@ class shiftregister():
         self.latch = Pin(latch_pin, Pin.OUT)
         self.clock = Pin(clock_pin, Pin.OUT)
         self.data = Pin(data_pin, Pin.OUT)
+        #the new chain has not been written yet
+        self._latched = None
         
     def set_registerSize(self,size):
-        for i in range(size):
-            self.register.append(0)
+        self.size = size
+        self.bits &= (1 << size) - 1
+
+    # list view of the register, index 0 is Q0
+    @property
+    def register(self):
+        return registerview(self)
+
+    @register.setter
+    def register(self, values):
+        bits = 0
+        for i in range(len(values)):
+            if values[i]:
+                bits |= 1 << i
+        if len(values) > self.size:
+            self.size = len(values)
+        self.bits = bits
+
+    def set_bit(self, index, value):
+        if value:
+            self.bits |= 1 << index
+        else:
+            self.bits &= ~(1 << index)
+
+    def set_bits(self, mask):
+        self.bits = mask & ((1 << self.size) - 1)
+
+    # light the first n outputs, for example a bar graph
+    def set_bar(self, n):
+        if n < 0:
+            n = 0
+        elif n > self.size:
+            n = self.size
+        self.bits = (1 << n) - 1
 
     def set_register(self):
+        bits = self.bits
         #open latch for data
         self.clock.low()
         self.latch.low()
         self.clock.high()
 
         #load data in register
-        for i in range(len(self.register)-1, -1, -1):
+        for i in range(self.size-1, -1, -1):
             self.clock.low()
-            if self.register[i] == 1:
-                self.data.high()
-            else:
-                self.data.low()
+            self.data.value((bits >> i) & 1)
             self.clock.high()
 
         #close latch for data
         self.clock.low()
         self.latch.high()
-        self.clock.high()
\ No newline at end of file
+        self.clock.high()
+        self._latched = bits
+        self.writes += 1
+
+    #True when the register differs from what the chain is showing
+    @property
+    def dirty(self):
+        return self.bits != self._latched
+
+    def write_if_changed(self):
+        if self.bits == self._latched:
+            self.skipped += 1
+            return False
+        self.set_register()
+        return True
+
+    def reset_counters(self):
+        self.writes = 0
+        self.skipped = 0
@@ -7,17 +7,17 @@ def main():
     shift = sr.shiftregister()
     shift.set_registerSize(8)
     shift.set_pins(17,16,18)
-    shift.register = [0,0,0,0,0,0,0,0]
+    shift.set_bits(0)
     shift.set_register()
 
     try:
-        for i in range(0,len(shift.register)):
-            shift.register[i] = 1
+        for i in range(0,shift.size):
+            shift.set_bit(i, 1)
             shift.set_register()
             time.sleep(.5)
         print("register = {0}".format(shift.register))
         time.sleep(3)
-        shift.register = [0,0,0,0,0,0,0,0]
+        shift.set_bits(0)
         shift.set_register()
         print("register = {0}".format(shift.register))
     except KeyboardInterrupt:
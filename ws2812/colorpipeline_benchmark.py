@@ -0,0 +1,41 @@
+import array, gc, time
+import colorpipeline
+
+# Per-frame cost of the colour pipeline for a 300 LED strip
+# Runs on the board or on the host with the MicroPython unix port:
+#   micropython colorpipeline_benchmark.py
+# The frame budget is the time one frame takes on the wire at 800kHz (30us per LED),
+# building a frame must be faster so the CPU is never what limits the frame rate
+# The heap is also checked, building frames must not allocate
+
+LED_COUNT = 300
+FRAMES = 200
+BUDGET_US = LED_COUNT * 30
+
+def run(name, fn):
+    fn()
+    gc.collect()
+    before = gc.mem_alloc()
+    start = time.ticks_us()
+    for _ in range(FRAMES):
+        fn()
+    elapsed = time.ticks_diff(time.ticks_us(), start)
+    allocated = gc.mem_alloc() - before
+    per_frame = elapsed / FRAMES
+    ok = per_frame < BUDGET_US and allocated == 0
+    print("{0:10s} {1:8.1f}us/frame  budget {2}us  allocated {3}  {4}".format(
+        name, per_frame, BUDGET_US, allocated, "PASS" if ok else "FAIL"))
+    return ok
+
+def main():
+    src = array.array("I", [(i * 0x010203) & 0xFFFFFF for i in range(LED_COUNT)])
+    words = array.array("I", [0 for _ in range(LED_COUNT)])
+    buf = bytearray(LED_COUNT * 3)
+    pipeline = colorpipeline.ColorPipeline(LED_COUNT, brightness=0.1)
+
+    ok = run("to_words", lambda: pipeline.to_words(src, words))
+    ok = run("to_bytes", lambda: pipeline.to_bytes(src, buf)) and ok
+    print("PASS" if ok else "FAIL")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import array, time
+import micropython
+import uasyncio as asyncio
+
+# Precomputed WS2812 effects
+# The colour wheel is built once as 256 packed GRB values, the same format as WS2812.ar,
+# so a frame is only table lookups at rotated indices
+# An effect has frame(), which writes the next frame into strip.ar, play() shows the
+# frames at a fixed rate without blocking other tasks
+# Works with WS2812 and WS2812Strips
+
+def _pack(r, g, b):
+    return (g<<16) + (r<<8) + b
+
+def _wheel(pos):
+    # The colours are a transition r - g - b - back to r.
+    if pos < 85:
+        return _pack(255 - pos * 3, pos * 3, 0)
+    if pos < 170:
+        pos -= 85
+        return _pack(0, 255 - pos * 3, pos * 3)
+    pos -= 170
+    return _pack(pos * 3, 0, 255 - pos * 3)
+
+WHEEL = array.array("I", [_wheel(pos) for pos in range(256)])
+
+# dst[i] = table[(index[i] + step) & 255]
+@micropython.viper
+def _rotate(dst, table, index, step: int, n: int):
+    d = ptr32(dst)
+    t = ptr32(table)
+    x = ptr8(index)
+    for i in range(n):
+        d[i] = t[(x[i] + step) & 255]
+
+class Rainbow():
+    def __init__(self, strip):
+        self.strip = strip
+        n = len(strip.ar)
+        # wheel position of every LED at step 0, spread over the whole strip
+        self.index = bytearray([(i * 256 // n) & 255 for i in range(n)])
+        self.step = 0
+
+    def frame(self):
+        _rotate(self.strip.ar, WHEEL, self.index, self.step, len(self.index))
+        self.step = (self.step + 1) & 255
+
+class ColorChase():
+    def __init__(self, strip, color):
+        self.strip = strip
+        self.color = _pack(color[0], color[1], color[2])
+        self.step = 0
+
+    # one more LED per frame, then start again from a dark strip
+    def frame(self):
+        ar = self.strip.ar
+        if self.step == 0:
+            for i in range(len(ar)):
+                ar[i] = 0
+        ar[self.step] = self.color
+        self.step += 1
+        if self.step == len(ar):
+            self.step = 0
+
+# show frames of effect at fps, forever or for a number of frames
+# deadlines are absolute, so slow frames do not make the effect drift
+async def play(strip, effect, fps, frames=None):
+    period = 1000 // fps
+    deadline = time.ticks_ms()
+    count = 0
+    while frames is None or count < frames:
+        effect.frame()
+        # pixels_show() busy-waits for the previous frame, wait here so other tasks keep running
+        await strip.wait_done_async()
+        strip.pixels_show()
+        deadline = time.ticks_add(deadline, period)
+        delay = time.ticks_diff(deadline, time.ticks_ms())
+        if delay > 0:
+            await asyncio.sleep_ms(delay)
+        else:
+            # too far behind, start counting from now
+            deadline = time.ticks_ms()
+            await asyncio.sleep_ms(0)
+        count += 1
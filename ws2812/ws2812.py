@@ -1,6 +1,8 @@
 import array, time
 from machine import Pin
+import micropython
 import rp2
+import uasyncio as asyncio
 
 # Configure the number of WS2812 LEDs.
 #brightness = 0.2
@@ -17,24 +19,139 @@ def ws2812():
     label("do_zero")
     nop() .side(0) [T2 - 1]
     wrap()
+
+# Frames are streamed from a buffer into the PIO TX FIFO by DMA, pixels_show() returns at once
+# A frame is done when the FIFO has drained and the data line has been low for the reset time
+RESET_US = 300 # WS2812B latch time, older WS2812 parts only need 50us
+PIXEL_US = 30 # 24 bits at 800kHz
+FIFO_DEPTH = 4
+PIO_BASE = (0x50200000, 0x50300000)
+PIO_TXF0 = 0x10
+DREQ_PIO_TX = (0, 8)
+
+# State machines 0-3 are in PIO0, 4-7 in PIO1, each strip claims a free one
+# A state machine already running code from elsewhere (for example pio595display) is
+# skipped, one that is set up but not started yet cannot be seen and must not be shared
+STATE_MACHINES = 8
+_claimed = [False] * STATE_MACHINES
+# strips already created, by pin, so callers can reuse them with WS2812.get()
+_strips = {}
+
+# a free state machine, it is only marked claimed once the strip using it is set up
+def _free_sm():
+    for i in range(STATE_MACHINES):
+        if not _claimed[i] and not rp2.StateMachine(i).active():
+            return i
+    raise RuntimeError("no free PIO state machine")
+
+# Scale every colour byte of src through lut into dst, n pixels packed as GRB
+# in the top 24 bits, ready for the PIO to shift out MSB first
+@micropython.viper
+def _dim(src, dst, lut, n: int):
+    s = ptr32(src)
+    d = ptr32(dst)
+    l = ptr8(lut)
+    for i in range(n):
+        c = s[i]
+        d[i] = (l[(c >> 16) & 0xFF] << 24) | (l[(c >> 8) & 0xFF] << 16) | (l[c & 0xFF] << 8)
+
 class WS2812():        
-    def __init__(self, pin_num, led_count, brightness = 0.5):
+    # pixels can live in a larger shared array, this strip then uses led_count entries from offset
+    def __init__(self, pin_num, led_count, brightness = 0.5, pixels=None, offset=0):
         self.Pin = Pin
+        self.pin_num = pin_num
         self.led_count = led_count
+        self._lut = bytearray(256)
         self.brightness = brightness
-        self.sm = rp2.StateMachine(0, ws2812, freq=8_000_000, sideset_base=Pin(pin_num))
+        # optional colorpipeline.ColorPipeline, replaces the linear brightness table
+        self.pipeline = None
+        self.sm_id = _free_sm()
+        if pixels is None:
+            self.ar = array.array("I", [0 for _ in range(led_count)])
+        else:
+            self.ar = memoryview(pixels)[offset:offset + led_count]
+        # two output buffers, the next frame is built while DMA sends the previous one
+        self.dimmer_ar = [array.array("I", [0 for _ in range(led_count)]) for _ in range(2)]
+        self._back = 0
+
+        pio = self.sm_id // 4
+        self._txf = PIO_BASE[pio] + PIO_TXF0 + 4 * (self.sm_id % 4)
+        self._pending = False
+        self._ready_at = time.ticks_us()
+        self.dma = None
+        try:
+            self.sm = rp2.StateMachine(self.sm_id, ws2812, freq=8_000_000, sideset_base=Pin(pin_num))
+            self.dma = rp2.DMA()
+            self._ctrl = self.dma.pack_ctrl(size=2, inc_read=True, inc_write=False,
+                                            treq_sel=DREQ_PIO_TX[pio] + self.sm_id % 4, irq_quiet=False)
+            self.dma.irq(self._dma_done)
+        except:
+            # nothing is claimed yet, give back the DMA channel if it was opened
+            if self.dma is not None:
+                self.dma.close()
+            raise
         self.sm.active(1)
-        self.ar = array.array("I", [0 for _ in range(led_count)])
+        _claimed[self.sm_id] = True
+        _strips[pin_num] = self
+
+    # reuse the strip already driving pin_num instead of claiming another state machine
+    @classmethod
+    def get(cls, pin_num, led_count, brightness = 0.5):
+        strip = _strips.get(pin_num)
+        if strip is not None and strip.led_count == led_count:
+            return strip
+        if strip is not None:
+            strip.deinit()
+        return cls(pin_num, led_count, brightness)
+
+    # brightness is applied through a 256 entry table, rebuilt only when it changes
+    @property
+    def brightness(self):
+        return self._brightness
+
+    @brightness.setter
+    def brightness(self, value):
+        self._brightness = value
+        for i in range(256):
+            self._lut[i] = min(255, int(i * value))
         
+    def _dma_done(self, dma):
+        # the FIFO and the output shift register still hold a few pixels
+        drain_us = (FIFO_DEPTH + 1) * PIXEL_US + RESET_US
+        self._ready_at = time.ticks_add(time.ticks_us(), drain_us)
+        self._pending = False
+
+    def frame_done(self):
+        return not self._pending and time.ticks_diff(time.ticks_us(), self._ready_at) >= 0
+
+    # block until the previous frame has been latched, at most one frame time
+    def wait_done(self):
+        while not self.frame_done():
+            pass
+
+    async def wait_done_async(self):
+        while not self.frame_done():
+            await asyncio.sleep_ms(0)
+
     def pixels_show(self):
-        dimmer_ar = array.array("I", [0 for _ in range(self.led_count)])
-        for i,c in enumerate(self.ar):
-            r = int(((c >> 8) & 0xFF) * self.brightness)
-            g = int(((c >> 16) & 0xFF) * self.brightness)
-            b = int((c & 0xFF) * self.brightness)
-            dimmer_ar[i] = (g<<16) + (r<<8) + b
-        self.sm.put(dimmer_ar, 8)
-        time.sleep_ms(10)
+        back = self.dimmer_ar[self._back]
+        if self.pipeline is None:
+            _dim(self.ar, back, self._lut, self.led_count)
+        else:
+            self.pipeline.to_words(self.ar, back, self.led_count)
+        self.wait_done()
+        self._pending = True
+        self.dma.config(read=back, write=self._txf, count=self.led_count, ctrl=self._ctrl, trigger=True)
+        self._back ^= 1
+
+    def deinit(self):
+        self.wait_done()
+        self.dma.irq(None)
+        self.dma.close()
+        self.sm.active(0)
+        _claimed[self.sm_id] = False
+        if _strips.get(self.pin_num) is self:
+            del _strips[self.pin_num]
 
     def pixels_set(self, i, color):
         self.ar[i] = (color[1]<<16) + (color[0]<<8) + color[2]
@@ -71,3 +188,44 @@ class WS2812():
             self.pixels_show()
             time.sleep(wait)
 
+# Up to 8 strips driven in parallel, one state machine and DMA channel each
+# All strips share one pixel array, pixel i of the whole set is strip i // led_count
+class WS2812Strips():
+    def __init__(self, pins, led_count, brightness = 0.5):
+        self.led_count = led_count
+        self.ar = array.array("I", [0 for _ in range(led_count * len(pins))])
+        self.strips = []
+        try:
+            for i in range(len(pins)):
+                self.strips.append(WS2812(pins[i], led_count, brightness, self.ar, i * led_count))
+        except:
+            # give back the state machines and DMA channels of the strips already made
+            self.deinit()
+            raise
+
+    def pixels_set(self, i, color):
+        self.ar[i] = (color[1]<<16) + (color[0]<<8) + color[2]
+
+    def pixels_fill(self, color):
+        for i in range(len(self.ar)):
+            self.pixels_set(i, color)
+
+    # every strip starts its DMA and returns, so the strips are sent at the same time
+    def pixels_show(self):
+        for strip in self.strips:
+            strip.pixels_show()
+
+    def frame_done(self):
+        for strip in self.strips:
+            if not strip.frame_done():
+                return False
+        return True
+
+    async def wait_done_async(self):
+        for strip in self.strips:
+            await strip.wait_done_async()
+
+    def deinit(self):
+        for strip in self.strips:
+            strip.deinit()
+        self.strips = []